@@ -1,3 +1,36 @@
-__all__ = ["RaskSDKClient"]
+from typing import TYPE_CHECKING
 
-from rask_sdk.clients.rask_client import RaskSDKClient
+from rask_sdk.utils import deadline
+from rask_sdk.utils import lazy_module_getattr
+
+
+if TYPE_CHECKING:
+    from rask_sdk.clients.batch import BatchResult
+    from rask_sdk.clients.compression import RequestCompression
+    from rask_sdk.clients.hedging import Hedging
+    from rask_sdk.clients.pool import ClientPool
+    from rask_sdk.clients.rask_client import RaskSDKClient
+    from rask_sdk.clients.uploads import UploadSource
+
+
+__all__ = [
+    "BatchResult",
+    "ClientPool",
+    "Hedging",
+    "RaskSDKClient",
+    "RequestCompression",
+    "UploadSource",
+    "deadline",
+]
+
+__getattr__ = lazy_module_getattr(
+    __name__,
+    {
+        "BatchResult": "rask_sdk.clients.batch",
+        "ClientPool": "rask_sdk.clients.pool",
+        "Hedging": "rask_sdk.clients.hedging",
+        "RaskSDKClient": "rask_sdk.clients.rask_client",
+        "RequestCompression": "rask_sdk.clients.compression",
+        "UploadSource": "rask_sdk.clients.uploads",
+    },
+)
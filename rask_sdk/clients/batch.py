@@ -0,0 +1,41 @@
+import dataclasses
+import uuid
+from http import HTTPStatus
+from typing import Generic
+from typing import Optional
+from typing import TypeVar
+
+from rask_sdk.exceptions.base import RaskClientException
+
+
+T = TypeVar("T")
+
+
+@dataclasses.dataclass
+class BatchResult(Generic[T]):
+    """Result of fetching a single item of a batch."""
+
+    id: uuid.UUID
+    value: Optional[T] = None
+    error: Optional[Exception] = None
+
+    @property
+    def not_found(self) -> bool:
+        """Whether the item does not exist."""
+
+        return (
+            isinstance(self.error, RaskClientException)
+            and self.error.status == HTTPStatus.NOT_FOUND
+        )
+
+    @property
+    def transient(self) -> bool:
+        """Whether fetching the item has failed on an error worth retrying."""
+
+        if isinstance(self.error, RaskClientException):
+            return (
+                self.error.status in (HTTPStatus.REQUEST_TIMEOUT, HTTPStatus.TOO_MANY_REQUESTS)
+                or self.error.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+
+        return self.error is not None
@@ -0,0 +1,96 @@
+import gzip
+import importlib.util
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+
+DEFAULT_MIN_SIZE = 16384  # 16kb
+
+
+def _gzip(level: int) -> Callable[[bytes], bytes]:
+    return lambda content: gzip.compress(content, compresslevel=level)
+
+
+def _brotli(level: int) -> Callable[[bytes], bytes]:
+    import brotli  # type: ignore[import-not-found]
+
+    return lambda content: brotli.compress(content, quality=level)
+
+
+def _zstd(level: int) -> Callable[[bytes], bytes]:
+    import zstandard  # type: ignore[import-not-found]
+
+    compressor = zstandard.ZstdCompressor(level=level)
+
+    return compressor.compress
+
+
+COMPRESSORS: Dict[str, Tuple[str, Callable[[int], Callable[[bytes], bytes]], int]] = {
+    # encoding: (required module, compressor factory, default level)
+    "gzip": ("gzip", _gzip, 6),
+    "br": ("brotli", _brotli, 5),
+    "zstd": ("zstandard", _zstd, 3),
+}
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Request body encodings supported by installed libraries, the most efficient first."""
+
+    return tuple(
+        encoding
+        for encoding in ("zstd", "br", "gzip")
+        if importlib.util.find_spec(COMPRESSORS[encoding][0]) is not None
+    )
+
+
+class RequestCompression:
+    """Compression of JSON request bodies larger than ``min_size`` bytes.
+
+    Compressed bytes and CPU time spent are accumulated, so the saving can be weighed
+    against its cost for the actual traffic.
+    """
+
+    def __init__(
+        self, encoding: str = "gzip", min_size: int = DEFAULT_MIN_SIZE, level: int = -1
+    ) -> None:
+        """."""
+
+        if encoding not in COMPRESSORS:
+            raise ValueError(
+                f"Unsupported encoding {encoding}. Supported encodings: {', '.join(COMPRESSORS)}."
+            )
+
+        _module, factory, default_level = COMPRESSORS[encoding]
+
+        self.encoding = encoding
+        self.min_size = min_size
+        self._compress = factory(level if level >= 0 else default_level)
+
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.cpu_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def compress(self, content: bytes) -> bytes:
+        """Compress content, recording its statistics."""
+
+        started_at = time.thread_time()
+        compressed = self._compress(content)
+
+        cpu_seconds = time.thread_time() - started_at
+
+        with self._lock:
+            self.cpu_seconds += cpu_seconds
+            self.raw_bytes += len(content)
+            self.compressed_bytes += len(compressed)
+
+        return compressed
+
+    @property
+    def saved_bytes(self) -> int:
+        """Number of bytes not sent thanks to compression."""
+
+        return self.raw_bytes - self.compressed_bytes
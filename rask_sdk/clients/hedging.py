@@ -0,0 +1,114 @@
+import asyncio
+import collections
+import time
+from typing import Awaitable
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import TypeVar
+
+
+T = TypeVar("T")
+
+
+class Hedging:
+    """Hedged requests for idempotent reads.
+
+    If a request has not completed within the ``quantile`` of latencies recently observed for
+    its endpoint, a second identical request is issued and whichever completes first wins,
+    the other one being cancelled. Until ``min_samples`` latencies are collected,
+    ``initial_delay`` is used instead.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 500,
+    ) -> None:
+        """."""
+
+        self._quantile = quantile
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._min_samples = min_samples
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def hedge_win_rate(self) -> float:
+        """Share of hedged requests where the hedge has completed first."""
+
+        return self.hedge_wins / self.hedges if self.hedges else 0.0
+
+    def delay(self, endpoint: str) -> float:
+        """Time to wait for the first request before hedging it."""
+
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self._min_samples:
+            return self._initial_delay
+
+        ordered = sorted(latencies)
+        index = min(int(len(ordered) * self._quantile), len(ordered) - 1)
+
+        return max(ordered[index], self._min_delay)
+
+    def _record(self, endpoint: str, latency: float) -> None:
+        if endpoint not in self._latencies:
+            self._latencies[endpoint] = collections.deque(maxlen=self._window)
+
+        self._latencies[endpoint].append(latency)
+
+    async def run(self, endpoint: str, request: Callable[[], Awaitable[T]]) -> T:
+        """Run the request, hedging it if it is slower than usual for the endpoint."""
+
+        def completed(attempt: "asyncio.Future[T]") -> T:
+            # Latency is measured from the start of the primary request, as that is what
+            # the caller has waited for, so a winning hedge does not lower the quantile
+            result = attempt.result()
+            self._record(endpoint=endpoint, latency=time.monotonic() - started_at)
+
+            return result
+
+        self.requests += 1
+        started_at = time.monotonic()
+        primary: "asyncio.Future[T]" = asyncio.ensure_future(request())
+        hedge: Optional["asyncio.Future[T]"] = None
+
+        try:
+            await asyncio.wait({primary}, timeout=self.delay(endpoint))
+            if primary.done():
+                return completed(primary)
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(request())
+            pending: Set["asyncio.Future[T]"] = {primary, hedge}
+            error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+
+                        return completed(task)
+
+                    error = error or task.exception()
+
+            assert error is not None
+            raise error
+        finally:
+            for attempt in (primary, hedge):
+                if attempt is not None and not attempt.done():
+                    attempt.cancel()
@@ -0,0 +1,231 @@
+import asyncio
+import collections
+import dataclasses
+import time
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+import httpx
+from rask_sdk.clients.rask_client import RaskSDKClient
+
+
+# Marks arguments not passed, as ``None`` disables the limit
+_DEFAULT: Any = object()
+
+
+class _RateLimiter:
+    """Token bucket allowing ``rate`` requests per second with bursts of ``burst``."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """."""
+
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self._tokens + (now - self._updated_at) * self._rate, self._burst
+            )
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream calling ``release`` once the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        """."""
+
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+@dataclasses.dataclass
+class _Tenant:
+    client_id: str
+    client_secret: str
+    max_concurrency: Optional[int]
+    rate_limiter: Optional[_RateLimiter]
+    semaphore: Optional[asyncio.Semaphore] = None
+
+
+class _TenantTransport(httpx.AsyncBaseTransport):
+    """Transport enforcing tenant limits on top of the shared one, which it never closes."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, tenant: _Tenant) -> None:
+        """."""
+
+        self._transport = transport
+        self._tenant = tenant
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tenant = self._tenant
+
+        if tenant.rate_limiter is not None:
+            await tenant.rate_limiter.acquire()
+
+        if tenant.max_concurrency is None:
+            return await self._transport.handle_async_request(request)
+
+        if tenant.semaphore is None:
+            tenant.semaphore = asyncio.Semaphore(tenant.max_concurrency)
+
+        # Request is in flight until its response body is read, so the slot is held till then
+        await tenant.semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            tenant.semaphore.release()
+            raise
+
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(stream=response.stream, release=tenant.semaphore.release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        pass
+
+
+class ClientPool:
+    """Clients of many tenants sharing a single HTTP transport.
+
+    Every tenant has its own credentials, token and limits: ``max_concurrency`` requests in
+    flight and ``rate_limit`` requests per second with bursts of ``burst`` requests, which
+    may be overridden on registration. Connections are shared by all tenants, and clients of
+    tenants which have not been used recently are evicted once there are more than
+    ``max_clients`` of them, to be created again with a new token on next use. Other
+    keyword arguments are passed to every ``RaskSDKClient`` created.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_clients: int = 100,
+        max_concurrency: Optional[int] = 8,
+        rate_limit: Optional[float] = None,
+        burst: int = 1,
+        **client_kwargs: Any,
+    ) -> None:
+        """."""
+
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._max_clients = max_clients
+        self._max_concurrency = max_concurrency
+        self._rate_limit = rate_limit
+        self._burst = burst
+        self._client_kwargs = client_kwargs
+        self._tenants: Dict[str, _Tenant] = {}
+        self._clients: "collections.OrderedDict[str, RaskSDKClient]" = (
+            collections.OrderedDict()
+        )
+
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, tenant: str) -> bool:
+        return tenant in self._tenants
+
+    def register(
+        self,
+        tenant: str,
+        client_id: str,
+        client_secret: str,
+        max_concurrency: Optional[int] = _DEFAULT,
+        rate_limit: Optional[float] = _DEFAULT,
+        burst: int = _DEFAULT,
+    ) -> None:
+        """Register tenant credentials and limits, replacing the previous ones if any.
+
+        Limits not passed are the pool ones, and ``None`` disables the limit for the tenant.
+        """
+
+        if max_concurrency is _DEFAULT:
+            max_concurrency = self._max_concurrency
+        if rate_limit is _DEFAULT:
+            rate_limit = self._rate_limit
+        if burst is _DEFAULT:
+            burst = self._burst
+
+        self._clients.pop(tenant, None)
+        self._tenants[tenant] = _Tenant(
+            client_id=client_id,
+            client_secret=client_secret,
+            max_concurrency=max_concurrency,
+            rate_limiter=(
+                _RateLimiter(rate=rate_limit, burst=burst) if rate_limit is not None else None
+            ),
+        )
+
+    def unregister(self, tenant: str) -> None:
+        """Forget the tenant along with its client."""
+
+        self._clients.pop(tenant, None)
+        del self._tenants[tenant]
+
+    def get(self, tenant: str) -> RaskSDKClient:
+        """Get client of the tenant, creating it if it has been evicted."""
+
+        if tenant in self._clients:
+            self._clients.move_to_end(tenant)
+            return self._clients[tenant]
+
+        if tenant not in self._tenants:
+            raise KeyError(f"Tenant {tenant} is not registered.")
+
+        tenant_ = self._tenants[tenant]
+        client = RaskSDKClient(
+            client_id=tenant_.client_id,
+            client_secret=tenant_.client_secret,
+            transport=_TenantTransport(transport=self._transport, tenant=tenant_),
+            **self._client_kwargs,
+        )
+        self._clients[tenant] = client
+
+        while len(self._clients) > self._max_clients:
+            self._clients.popitem(last=False)
+            self.evictions += 1
+
+        return client
+
+    async def aclose(self) -> None:
+        """Close connections shared by all tenants."""
+
+        self._clients.clear()
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
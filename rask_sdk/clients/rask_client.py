@@ -1,27 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
 import uuid
 from http import HTTPStatus
 from json import JSONDecodeError
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
 from typing import BinaryIO
+from typing import Callable
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import TypeVar
 
-from authlib.integrations.base_client import OAuthError  # type: ignore[import-untyped]
-from authlib.integrations.httpx_client import AsyncOAuth2Client  # type: ignore[import-untyped]
-from httpx import HTTPStatusError
-from httpx import Response
 from rask_sdk import enums
 from rask_sdk import schemas
+from rask_sdk.clients.batch import BatchResult
+from rask_sdk.clients.streaming import JSONArrayParser
+from rask_sdk.clients.uploads import MultipartStream
+from rask_sdk.clients.uploads import UploadSource
+from rask_sdk.clients.uploads import is_rewindable
+from rask_sdk.clients.uploads import source_filename
+from rask_sdk.concurrency import map_concurrently
 from rask_sdk.exceptions.base import RaskClientException
 from rask_sdk.utils import retry_on_auth_error
 
 
+if TYPE_CHECKING:
+    import pydantic
+    from httpx import AsyncBaseTransport
+    from httpx import Response
+    from rask_sdk.clients.compression import RequestCompression
+    from rask_sdk.clients.hedging import Hedging
+    from rask_sdk.storage.uploads import UploadIndex
+
+T = TypeVar("T")
+
+
 class RaskSDKClient:
     """Rask SDK Client."""
 
-    def __init__(self, client_id: str, client_secret: str) -> None:
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        upload_index: Optional[UploadIndex] = None,
+        compression: Optional[RequestCompression] = None,
+        transport: Optional[AsyncBaseTransport] = None,
+        hedging: Optional[Hedging] = None,
+    ) -> None:
         """."""
 
+        # Heavy HTTP / OAuth dependencies are imported on first client instantiation
+        from authlib.integrations.httpx_client import (  # type: ignore[import-untyped]
+            AsyncOAuth2Client,
+        )
+
         self._base_url = "https://api.rask.ai"
         self._client = AsyncOAuth2Client(
             f"{client_id}",
@@ -30,12 +69,19 @@ class RaskSDKClient:
             grant_type="client_credentials",
             scope=["api/source", "api/input", "api/output", "api/limit"],
             token_endpoint="https://rask-prod.auth.us-east-2.amazoncognito.com/oauth2/token",
+            transport=transport,
         )
+        self._upload_index = upload_index
+        self._compression = compression
+        self._hedging = hedging
+        self._auth_lock: Optional[asyncio.Lock] = None
 
     @staticmethod
     def _raise_for_status(response: Response) -> None:
         """Raise Rask Client Exception on HTTP errors occurred."""
 
+        from httpx import HTTPStatusError
+
         try:
             response.raise_for_status()
         except HTTPStatusError as exc:
@@ -51,36 +97,210 @@ class RaskSDKClient:
                 detail=err_detail.get("detail", "Unknown error occurred."),
             ) from exc
 
+    async def _get(self, endpoint: str, url: str, **kwargs: Any) -> Response:
+        """Send GET request, hedging it if enabled."""
+
+        if self._hedging is None:
+            return await self._client.get(url, **kwargs)
+
+        return await self._hedging.run(
+            endpoint=endpoint, request=lambda: self._client.get(url, **kwargs)
+        )
+
+    async def _send_stream(
+        self, method: str, url: str, body: MultipartStream, **kwargs: Any
+    ) -> Response:
+        """Send streamed request body signed with the bearer token.
+
+        The OAuth client signs requests with an auth flow which reads the whole body into
+        memory first, so streamed bodies are signed here instead.
+        """
+
+        from authlib.integrations.base_client import (  # type: ignore[import-untyped]
+            MissingTokenError,
+        )
+
+        if not self._client.token:
+            raise MissingTokenError()
+
+        await self._client.ensure_active_token(self._client.token)
+
+        return await self._client.request(
+            method,
+            url,
+            content=body,
+            headers={
+                **body.headers,
+                "Authorization": f"Bearer {self._client.token['access_token']}",
+            },
+            auth=None,
+            **kwargs,
+        )
+
+    async def _json_body(self, data: pydantic.BaseModel) -> Dict[str, Any]:
+        """Build JSON body request arguments, compressing large bodies if enabled.
+
+        Response encodings are negotiated by httpx, which advertises every decoder
+        installed (gzip and deflate, plus br and zstd with brotli / zstandard).
+        """
+
+        if self._compression is None:
+            return {"json": data.model_dump(mode="json")}
+
+        # The token is fetched beforehand, so the body is not compressed again by the
+        # request being retried on a missing token
+        if not self._client.token:
+            await self.authenticate()
+
+        content = data.model_dump_json().encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+
+        if len(content) >= self._compression.min_size:
+            content = await asyncio.get_running_loop().run_in_executor(
+                None, self._compression.compress, content
+            )
+            headers["Content-Encoding"] = self._compression.encoding
+
+        return {"content": content, "headers": headers}
+
+    @contextlib.asynccontextmanager
+    async def _stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[Response]:
+        """Open streaming request, authenticating and retrying once on missing or expired token."""
+
+        from authlib.integrations.base_client import (  # type: ignore[import-untyped]
+            MissingRequestTokenError,
+        )
+        from authlib.integrations.base_client import MissingTokenError
+        from authlib.integrations.base_client import TokenExpiredError
+
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                response = await stack.enter_async_context(
+                    self._client.stream(method, url, **kwargs)
+                )
+            except (MissingTokenError, MissingRequestTokenError, TokenExpiredError):
+                await self.authenticate()
+                response = await stack.enter_async_context(
+                    self._client.stream(method, url, **kwargs)
+                )
+
+            if response.is_error:
+                await response.aread()
+            self._raise_for_status(response=response)
+
+            yield response
+
+    async def _get_many(
+        self,
+        get: Callable[[uuid.UUID], Awaitable[T]],
+        ids: Iterable[uuid.UUID],
+        concurrency: int,
+    ) -> AsyncIterator[BatchResult[T]]:
+        """Fetch items by unique ids provided yielding results as they arrive."""
+
+        from httpx import TransportError
+        from pydantic import ValidationError
+
+        async def get_one(id_: uuid.UUID) -> BatchResult[T]:
+            try:
+                return BatchResult(id=id_, value=await get(id_))
+            except (RaskClientException, TransportError, ValidationError) as exc:
+                return BatchResult(id=id_, error=exc)
+
+        async for result in map_concurrently(get_one, dict.fromkeys(ids), concurrency):
+            yield result
+
     async def authenticate(self) -> None:
         """Fetch new token for the instantiated client."""
 
-        try:
-            await self._client.fetch_token()
-        except OAuthError as exc:
-            raise RaskClientException(
-                status_code=HTTPStatus.UNAUTHORIZED, detail="Authentication error occurred."
-            ) from exc
+        from authlib.integrations.base_client import OAuthError  # type: ignore[import-untyped]
+
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+
+        token = self._client.token
+        async with self._auth_lock:
+            # Concurrent calls failing on a missing token share the token fetched first
+            current = self._client.token
+            if current is not None and current is not token and not current.is_expired():
+                return
+
+            try:
+                await self._client.fetch_token()
+            except OAuthError as exc:
+                raise RaskClientException(
+                    status_code=HTTPStatus.UNAUTHORIZED,
+                    detail="Authentication error occurred.",
+                ) from exc
 
     # Users
     @retry_on_auth_error()
     async def get_credits(self) -> schemas.CreditsGet:
         """Get credits of the current user."""
 
-        credits_ = await self._client.get(f"{self._base_url}/v2/credits")
+        credits_ = await self._get("get_credits", f"{self._base_url}/v2/credits")
         self._raise_for_status(response=credits_)
 
         return schemas.CreditsGet.model_validate(obj=credits_.json())
 
     # Media
-    @retry_on_auth_error()
     async def create_media_file(
-        self, file: BinaryIO, kind: Optional[enums.MediaKind] = None, timeout: int = 1800
+        self,
+        file: UploadSource,
+        kind: Optional[enums.MediaKind] = None,
+        timeout: int = 1800,
+        filename: Optional[str] = None,
     ) -> schemas.MediaGet:
-        """Create media by binary file provided."""
+        """Create media by binary file provided.
 
-        media = await self._client.post(
+        Besides binary files, the content can be given as a buffer (bytes, memoryview, mmap)
+        or an async iterator of bytes, e.g. a download being piped into the upload; it is
+        streamed into the request without intermediate copies.
+
+        If the client has an upload index, media with the same content uploaded before is
+        reused instead of being uploaded again. Async iterators are never indexed. Only the
+        requests are retried on a missing token, so the file is hashed once.
+        """
+
+        if self._upload_index is None or not is_rewindable(file):
+            return await self._upload_media_file(
+                file=file, kind=kind, timeout=timeout, filename=filename
+            )
+
+        digest = await self._upload_index.hash_file(file=file)
+
+        async with self._upload_index.lock(digest=digest):
+            media_id = self._upload_index.get(digest=digest, kind=kind)
+            if media_id is not None:
+                indexed_media = await self._get_indexed_media(media_id=media_id)
+                if indexed_media is not None:
+                    return indexed_media
+
+                self._upload_index.delete(digest=digest, kind=kind)
+
+            media = await self._upload_media_file(
+                file=file, kind=kind, timeout=timeout, filename=filename
+            )
+            self._upload_index.set(digest=digest, media_id=media.id, kind=kind)
+
+        return media
+
+    @retry_on_auth_error()
+    async def _upload_media_file(
+        self,
+        file: UploadSource,
+        kind: Optional[enums.MediaKind],
+        timeout: int,
+        filename: Optional[str],
+    ) -> schemas.MediaGet:
+        """Upload media file."""
+
+        media = await self._send_stream(
+            "POST",
             f"{self._base_url}/api/library/v1/media",
-            files={"data": file},
+            body=MultipartStream(
+                fields={"data": (filename or source_filename(file, default="upload"), file)}
+            ),
             params={"kind": kind.value if kind is not None else None},
             timeout=timeout,
         )
@@ -88,13 +308,29 @@ class RaskSDKClient:
 
         return schemas.MediaGet.model_validate(obj=media.json())
 
+    async def _get_indexed_media(self, media_id: uuid.UUID) -> Optional[schemas.MediaGet]:
+        """Get previously uploaded media if it is still usable."""
+
+        try:
+            media = await self.get_media(media_id=media_id)
+        except RaskClientException as exc:
+            if exc.status == HTTPStatus.NOT_FOUND:
+                return None
+
+            raise
+
+        if media.status is enums.MediaStatus.FAILED or media.deleted_at is not None:
+            return None
+
+        return media
+
     @retry_on_auth_error()
     async def create_media_link(self, data: schemas.MediaCreateLink) -> schemas.MediaGet:
         """Create media by link provided."""
 
         media = await self._client.post(
             f"{self._base_url}/api/library/v1/media/link",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=media)
 
@@ -104,13 +340,24 @@ class RaskSDKClient:
     async def get_media(self, media_id: uuid.UUID) -> schemas.MediaGet:
         """Get media by id."""
 
-        media = await self._client.get(
-            f"{self._base_url}/api/library/v1/media/{str(media_id)}"
+        media = await self._get(
+            "get_media", f"{self._base_url}/api/library/v1/media/{str(media_id)}"
         )
         self._raise_for_status(response=media)
 
         return schemas.MediaGet.model_validate(obj=media.json())
 
+    async def get_media_many(
+        self, media_ids: Iterable[uuid.UUID], concurrency: int = 16
+    ) -> AsyncIterator[BatchResult[schemas.MediaGet]]:
+        """Get media by ids yielding a result per id as soon as it arrives."""
+
+        async def get(media_id: uuid.UUID) -> schemas.MediaGet:
+            return await self.get_media(media_id=media_id)
+
+        async for result in self._get_many(get=get, ids=media_ids, concurrency=concurrency):
+            yield result
+
     # Projects
     @retry_on_auth_error()
     async def create_project(self, data: schemas.ProjectCreate) -> schemas.ProjectGet:
@@ -118,7 +365,7 @@ class RaskSDKClient:
 
         project = await self._client.post(
             f"{self._base_url}/v2/projects",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=project)
 
@@ -128,7 +375,9 @@ class RaskSDKClient:
     async def get_project(self, project_id: uuid.UUID) -> schemas.ProjectGet:
         """Get project by id."""
 
-        project = await self._client.get(f"{self._base_url}/v2/projects/{str(project_id)}")
+        project = await self._get(
+            "get_project", f"{self._base_url}/v2/projects/{str(project_id)}"
+        )
         self._raise_for_status(response=project)
 
         return schemas.ProjectGet.model_validate(obj=project.json())
@@ -139,7 +388,8 @@ class RaskSDKClient:
     ) -> schemas.ProjectsGet:
         """Get projects."""
 
-        projects = await self._client.get(
+        projects = await self._get(
+            "get_projects",
             f"{self._base_url}/v2/projects",
             params={
                 "offset": offset,
@@ -151,6 +401,47 @@ class RaskSDKClient:
 
         return schemas.ProjectsGet.model_validate(obj=projects.json())
 
+    async def iter_projects(
+        self, page_size: int = 100, concurrency: int = 4, name: Optional[str] = None
+    ) -> AsyncIterator[schemas.ProjectGetSlim]:
+        """Sweep all project list pages yielding every project once.
+
+        The first page tells the total, then the rest of the pages are requested
+        concurrently and their projects are yielded as soon as a page arrives.
+        """
+
+        async def get_page(offset: int) -> schemas.ProjectsGet:
+            return await self.get_projects(offset=offset, limit=page_size, name=name)
+
+        first_page = await get_page(offset=0)
+        offsets = range(page_size, first_page.total, page_size)
+        seen = set()
+
+        async def pages() -> AsyncIterator[schemas.ProjectsGet]:
+            yield first_page
+            async for page in map_concurrently(get_page, offsets, concurrency):
+                yield page
+
+        async for page in pages():
+            for project in page.projects:
+                # Offset pagination may return a project twice when the list shifts
+                if project.id in seen:
+                    continue
+                seen.add(project.id)
+
+                yield project
+
+    async def get_projects_by_ids(
+        self, project_ids: Iterable[uuid.UUID], concurrency: int = 16
+    ) -> AsyncIterator[BatchResult[schemas.ProjectGet]]:
+        """Get projects by ids yielding a result per id as soon as it arrives."""
+
+        async def get(project_id: uuid.UUID) -> schemas.ProjectGet:
+            return await self.get_project(project_id=project_id)
+
+        async for result in self._get_many(get=get, ids=project_ids, concurrency=concurrency):
+            yield result
+
     @retry_on_auth_error()
     async def generate_project(self, project_id: uuid.UUID) -> schemas.ProjectGet:
         """Generate project."""
@@ -169,8 +460,8 @@ class RaskSDKClient:
         """Patch project."""
 
         project = await self._client.patch(
-            f"{self._base_url}v2/projects/{str(project_id)}",
-            json=data.model_dump(mode="json"),
+            f"{self._base_url}/v2/projects/{str(project_id)}",
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=project)
 
@@ -180,8 +471,8 @@ class RaskSDKClient:
     async def get_project_voices(self, project_id: uuid.UUID) -> List[schemas.Voice]:
         """Get project voices."""
 
-        voices = await self._client.get(
-            f"{self._base_url}/v2/projects/{str(project_id)}/voices"
+        voices = await self._get(
+            "get_project_voices", f"{self._base_url}/v2/projects/{str(project_id)}/voices"
         )
         self._raise_for_status(response=voices)
 
@@ -211,7 +502,7 @@ class RaskSDKClient:
 
         response = await self._client.put(
             f"{self._base_url}/v2/projects/{str(project_id)}/lipsync",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=response)
 
@@ -221,7 +512,8 @@ class RaskSDKClient:
     async def get_lipsync_info(self, project_id: uuid.UUID) -> schemas.LipsyncInfo:
         """ "Get lipsync info."""
 
-        info = await self._client.get(
+        info = await self._get(
+            "get_lipsync_info",
             f"{self._base_url}/v2/projects/{str(project_id)}/lipsync",
         )
         self._raise_for_status(response=info)
@@ -237,7 +529,7 @@ class RaskSDKClient:
 
         transcription = await self._client.post(
             f"{self._base_url}/v2/transcriptions",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=transcription)
 
@@ -246,22 +538,26 @@ class RaskSDKClient:
     @retry_on_auth_error()
     async def create_transcription_srt(
         self,
-        src: Optional[BinaryIO] = None,
-        dst: Optional[BinaryIO] = None,
+        src: Optional[UploadSource] = None,
+        dst: Optional[UploadSource] = None,
         src_lang: Optional[str] = None,
         dst_lang: Optional[str] = None,
         timeout: int = 1800,
     ) -> schemas.TranscriptionId:
-        """Create transcription via .srt uploading."""
+        """Create transcription via .srt uploading.
 
-        files: Dict[str, BinaryIO] = {}
+        Files can also be given as buffers or async iterators of bytes, as in
+        ``create_media_file``.
+        """
+
+        files: Dict[str, Tuple[str, UploadSource]] = {}
         params: Dict[str, str] = {}
 
         if src is not None:
-            files["src"] = src
+            files["src"] = (source_filename(src, default="src.srt"), src)
 
         if dst is not None:
-            files["dst"] = dst
+            files["dst"] = (source_filename(dst, default="dst.srt"), dst)
 
         if src_lang is not None:
             params["src_lang"] = src_lang
@@ -269,9 +565,10 @@ class RaskSDKClient:
         if dst_lang is not None:
             params["dst_lang"] = dst_lang
 
-        transcription = await self._client.post(
+        transcription = await self._send_stream(
+            "POST",
             f"{self._base_url}/v2/transcriptions/srt",
-            files=files,
+            body=MultipartStream(fields=files),
             params=params,
             timeout=timeout,
         )
@@ -287,7 +584,8 @@ class RaskSDKClient:
     ) -> schemas.TranscriptionGet:
         """Get transcription associated with the project."""
 
-        transcription = await self._client.get(
+        transcription = await self._get(
+            "get_project_transcription",
             f"{self._base_url}/v2/projects/{str(project_id)}/transcription",
             params={"segment_ids": segment_ids} if segment_ids else None,
         )
@@ -295,6 +593,28 @@ class RaskSDKClient:
 
         return schemas.TranscriptionGet.model_validate(obj=transcription.json())
 
+    async def iter_project_transcription(
+        self,
+        project_id: uuid.UUID,
+        segment_ids: Optional[List[uuid.UUID]] = None,
+    ) -> AsyncIterator[schemas.SegmentGet]:
+        """Stream segments of the transcription associated with the project.
+
+        The response body is parsed incrementally, so only one segment is held in memory
+        at a time no matter how long the transcription is.
+        """
+
+        parser = JSONArrayParser(key="segments")
+
+        async with self._stream(
+            "GET",
+            f"{self._base_url}/v2/projects/{str(project_id)}/transcription",
+            params={"segment_ids": segment_ids} if segment_ids else None,
+        ) as transcription:
+            async for chunk in transcription.aiter_bytes():
+                for segment in parser.feed(chunk):
+                    yield schemas.SegmentGet.model_validate_json(segment)
+
     @retry_on_auth_error()
     async def add_project_transcription_segments(
         self, project_id: uuid.UUID, data: schemas.TranscriptionSegmentsCreate
@@ -303,7 +623,7 @@ class RaskSDKClient:
 
         transcription = await self._client.post(
             f"{self._base_url}/v2/projects/{str(project_id)}/transcription/segments",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=transcription)
 
@@ -317,7 +637,7 @@ class RaskSDKClient:
 
         transcription = await self._client.patch(
             f"{self._base_url}/v2/projects/{str(project_id)}/transcription/segments",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=transcription)
 
@@ -343,7 +663,7 @@ class RaskSDKClient:
 
         glossary = await self._client.post(
             f"{self._base_url}/v2/glossaries",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
 
         self._raise_for_status(response=glossary)
@@ -354,11 +674,24 @@ class RaskSDKClient:
     async def get_glossary(self, glossary_id: uuid.UUID) -> schemas.GlossaryGet:
         """Get glossary by id."""
 
-        glossary = await self._client.get(f"{self._base_url}/v2/glossaries/{str(glossary_id)}")
+        glossary = await self._get(
+            "get_glossary", f"{self._base_url}/v2/glossaries/{str(glossary_id)}"
+        )
         self._raise_for_status(response=glossary)
 
         return schemas.GlossaryGet.model_validate(obj=glossary.json())
 
+    async def get_glossaries_many(
+        self, glossary_ids: Iterable[uuid.UUID], concurrency: int = 16
+    ) -> AsyncIterator[BatchResult[schemas.GlossaryGet]]:
+        """Get glossaries by ids yielding a result per id as soon as it arrives."""
+
+        async def get(glossary_id: uuid.UUID) -> schemas.GlossaryGet:
+            return await self.get_glossary(glossary_id=glossary_id)
+
+        async for result in self._get_many(get=get, ids=glossary_ids, concurrency=concurrency):
+            yield result
+
     @retry_on_auth_error()
     async def update_glossary(
         self, glossary_id: uuid.UUID, data: schemas.GlossaryUpdate
@@ -367,7 +700,7 @@ class RaskSDKClient:
 
         glossary = await self._client.put(
             f"{self._base_url}/v2/glossaries/{str(glossary_id)}",
-            json=data.model_dump(mode="json"),
+            **(await self._json_body(data=data)),
         )
         self._raise_for_status(response=glossary)
 
@@ -0,0 +1,101 @@
+import re
+from typing import List
+from typing import Optional
+
+
+_TOKEN = re.compile(rb'[\\":{}\[\]]')
+
+BACKSLASH = ord("\\")
+QUOTE = ord('"')
+COLON = ord(":")
+OPENING = frozenset({ord("{"), ord("[")})
+CLOSING = frozenset({ord("}"), ord("]")})
+
+
+class JSONArrayParser:
+    """Incrementally extract raw items of the array stored under a top-level object key.
+
+    Chunks of a JSON document are fed as they arrive and every complete array item is
+    returned as raw bytes, so only the item being parsed is buffered at once.
+    """
+
+    def __init__(self, key: str) -> None:
+        """."""
+
+        self._key = key.encode("utf-8")
+        self._buffer = b""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start: Optional[int] = None
+        self._last_string: Optional[bytes] = None
+        self._current_key: Optional[bytes] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Feed the next chunk of the document returning array items completed by it."""
+
+        items: List[bytes] = []
+        buffer = self._buffer + chunk
+        position = self._position
+
+        for match in _TOKEN.finditer(buffer, position):
+            index = match.start()
+            if index < position:
+                # Character escaped by the preceding backslash
+                continue
+
+            char = buffer[index]
+            position = index + 1
+
+            if self._in_string:
+                if char == BACKSLASH:
+                    position = index + 2
+                elif char == QUOTE:
+                    self._in_string = False
+                    if self._string_start is not None:
+                        self._last_string = buffer[self._string_start : index]
+                        self._string_start = None
+                continue
+
+            if char == QUOTE:
+                self._in_string = True
+                if self._depth == 1 and self._array_depth is None:
+                    self._string_start = index + 1
+            elif char == COLON:
+                if self._depth == 1:
+                    self._current_key = self._last_string
+            elif char in OPENING:
+                self._depth += 1
+                if self._array_depth is None:
+                    if self._depth == 2 and self._current_key == self._key:
+                        self._array_depth = self._depth
+                elif self._depth == self._array_depth + 1 and self._item_start is None:
+                    self._item_start = index
+            elif char in CLOSING:
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if self._depth == self._array_depth and self._item_start is not None:
+                        items.append(buffer[self._item_start : index + 1])
+                        self._item_start = None
+                    elif self._depth < self._array_depth:
+                        self._array_depth = None
+                        self._current_key = None
+
+        # Keep only the bytes of the item or key which has not been completed yet. Position
+        # is past the buffer when it ends with a backslash, so the escaped character of the
+        # next chunk is still skipped
+        keep_from = min(
+            offset
+            for offset in (self._item_start, self._string_start, position, len(buffer))
+            if offset is not None
+        )
+        self._buffer = buffer[keep_from:]
+        self._position = position - keep_from
+        if self._item_start is not None:
+            self._item_start -= keep_from
+        if self._string_start is not None:
+            self._string_start -= keep_from
+
+        return items
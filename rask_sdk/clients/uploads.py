@@ -0,0 +1,149 @@
+import asyncio
+import mimetypes
+import mmap
+import os
+import re
+import uuid
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+
+CHUNK_SIZE = 1048576  # 1mb
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+UploadSource = Union[BinaryIO, Buffer, AsyncIterable[bytes]]
+
+# Percent-encoding of form parameter values as done by browsers and httpx
+FORM_PARAM_REPLACEMENTS = {'"': "%22", "\\": "\\\\"}
+FORM_PARAM_REPLACEMENTS.update({chr(c): f"%{c:02X}" for c in range(0x20) if c != 0x1B})
+FORM_PARAM_PATTERN = re.compile("|".join(re.escape(c) for c in FORM_PARAM_REPLACEMENTS))
+
+
+def form_param(name: str, value: str) -> str:
+    """Format the ``Content-Disposition`` parameter, escaping quotes and control characters."""
+
+    value = FORM_PARAM_PATTERN.sub(
+        lambda match: FORM_PARAM_REPLACEMENTS[match.group(0)], value
+    )
+
+    return f'{name}="{value}"'
+
+
+def is_rewindable(source: UploadSource) -> bool:
+    """Whether the source can be read before being uploaded, e.g. to be hashed."""
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return True
+
+    return not hasattr(source, "__aiter__") and source.seekable()
+
+
+def source_size(source: UploadSource) -> Optional[int]:
+    """Number of bytes left in the source, if it can be known without reading it."""
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return memoryview(source).nbytes
+
+    if hasattr(source, "__aiter__") or not source.seekable():
+        return None
+
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END) - position
+    source.seek(position)
+
+    return size
+
+
+def source_filename(source: UploadSource, default: str) -> str:
+    name = getattr(source, "name", None)
+
+    return os.path.basename(name) if isinstance(name, str) and name else default
+
+
+async def iter_source(
+    source: UploadSource, chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator[Union[bytes, memoryview]]:
+    """Iterate the source in chunks of at most ``chunk_size`` bytes.
+
+    Buffers are sliced without copying, files are read in a worker thread and chunks of async
+    iterators are split if they are too large, so a single chunk is buffered at a time.
+    """
+
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        view = memoryview(source).cast("B")
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset : offset + chunk_size]
+    elif hasattr(source, "__aiter__"):
+        async for chunk in source:
+            view = memoryview(chunk).cast("B")
+            for offset in range(0, len(view), chunk_size):
+                yield view[offset : offset + chunk_size]
+    else:
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, source.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+class MultipartStream:
+    """Streaming ``multipart/form-data`` body of file fields.
+
+    Sources are read only as the body is being sent, so uploads do not need to fit in
+    memory or be spooled to disk, and a slow connection slows down reading the source.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Tuple[str, UploadSource]],
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """."""
+
+        self._boundary = uuid.uuid4().hex
+        self._chunk_size = chunk_size
+        self._parts: List[Tuple[bytes, UploadSource]] = []
+
+        for name, (filename, source) in fields.items():
+            content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            header = (
+                f"--{self._boundary}\r\n"
+                "Content-Disposition: form-data; "
+                f"{form_param('name', name)}; {form_param('filename', filename)}\r\n"
+                f"Content-Type: {content_type}\r\n\r\n"
+            ).encode("utf-8")
+            self._parts.append((header, source))
+
+        self._closing = f"--{self._boundary}--\r\n".encode("utf-8")
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": f"multipart/form-data; boundary={self._boundary}"}
+
+        content_length = len(self._closing)
+        for header, source in self._parts:
+            size = source_size(source)
+            if size is None:
+                return headers
+
+            content_length += len(header) + size + 2
+
+        headers["Content-Length"] = str(content_length)
+
+        return headers
+
+    async def __aiter__(self) -> AsyncIterator[Union[bytes, memoryview]]:
+        for header, source in self._parts:
+            yield header
+            async for chunk in iter_source(source=source, chunk_size=self._chunk_size):
+                yield chunk
+            yield b"\r\n"
+
+        yield self._closing
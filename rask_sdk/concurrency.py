@@ -0,0 +1,40 @@
+import asyncio
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def map_concurrently(
+    func: Callable[[T], Awaitable[R]], items: Iterable[T], concurrency: Optional[int] = None
+) -> AsyncIterator[R]:
+    """Apply async function to every item yielding results in completion order.
+
+    At most ``concurrency`` calls are awaited at once; pending calls are cancelled when the
+    iteration is stopped early.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency) if concurrency is not None else None
+
+    async def call(item: T) -> R:
+        if semaphore is None:
+            return await func(item)
+
+        async with semaphore:
+            return await func(item)
+
+    tasks: List["asyncio.Future[R]"] = [asyncio.ensure_future(call(item)) for item in items]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
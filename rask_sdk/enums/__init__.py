@@ -1,5 +1,6 @@
 from rask_sdk.enums.media import MediaKind
 from rask_sdk.enums.media import MediaStatus
+from rask_sdk.enums.pipeline import DubbingStage
 from rask_sdk.enums.project import LipsyncStatus
 from rask_sdk.enums.project import ProjectSourceType
 from rask_sdk.enums.project import ProjectStatus
@@ -7,6 +8,7 @@ from rask_sdk.enums.project import SegmentStatus
 
 
 __all__ = [
+    "DubbingStage",
     "LipsyncStatus",
     "MediaKind",
     "MediaStatus",
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class DubbingStage(str, Enum):
+    """Dubbing pipeline stage."""
+
+    ADMISSION = "admission"
+    UPLOAD = "upload"
+    CREATE_PROJECT = "create_project"
+    WAIT_PROJECT = "wait_project"
+    GENERATE_PROJECT = "generate_project"
+    CHECK_FACE = "check_face"
+    LIPSYNC = "lipsync"
+    DONE = "done"
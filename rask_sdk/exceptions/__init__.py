@@ -1,4 +1,6 @@
 from rask_sdk.exceptions.base import RaskClientException
+from rask_sdk.exceptions.base import RaskJobException
+from rask_sdk.exceptions.base import RaskTimeoutException
 
 
-__all__ = ["RaskClientException"]
+__all__ = ["RaskClientException", "RaskJobException", "RaskTimeoutException"]
@@ -9,3 +9,20 @@ class RaskClientException(Exception):
 
     def __str__(self):
         return f"{self.status}: {super().__str__()}"
+
+
+class RaskTimeoutException(RaskClientException):
+    """Rask Timeout Exception."""
+
+
+class RaskJobException(Exception):
+    """Rask Job Exception."""
+
+    def __init__(self, stage: str, detail: str):
+        """."""
+
+        super().__init__(detail)
+        self.stage = stage
+
+    def __str__(self):
+        return f"{self.stage}: {super().__str__()}"
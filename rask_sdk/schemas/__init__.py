@@ -1,32 +1,38 @@
-from rask_sdk.schemas.glossary import GlossaryCreate
-from rask_sdk.schemas.glossary import GlossaryGet
-from rask_sdk.schemas.glossary import GlossaryIdGet
-from rask_sdk.schemas.glossary import GlossaryUpdate
-from rask_sdk.schemas.media import MediaCreateLink
-from rask_sdk.schemas.media import MediaGet
-from rask_sdk.schemas.project import CheckFaceTaskResponse
-from rask_sdk.schemas.project import LipsyncInfo
-from rask_sdk.schemas.project import LipsyncTaskData
-from rask_sdk.schemas.project import LipsyncTaskResponse
-from rask_sdk.schemas.project import ProjectCreate
-from rask_sdk.schemas.project import ProjectGet
-from rask_sdk.schemas.project import ProjectGetSlim
-from rask_sdk.schemas.project import ProjectPatch
-from rask_sdk.schemas.project import ProjectsGet
-from rask_sdk.schemas.project import SegmentCreate
-from rask_sdk.schemas.project import SegmentGet
-from rask_sdk.schemas.project import SegmentId
-from rask_sdk.schemas.project import SegmentPatch
-from rask_sdk.schemas.project import SegmentTextCreatePatch
-from rask_sdk.schemas.project import SegmentTextGet
-from rask_sdk.schemas.project import TranscriptionCreate
-from rask_sdk.schemas.project import TranscriptionGet
-from rask_sdk.schemas.project import TranscriptionId
-from rask_sdk.schemas.project import TranscriptionSegmentsCreate
-from rask_sdk.schemas.project import TranscriptionSegmentsPatch
-from rask_sdk.schemas.project import Voice
-from rask_sdk.schemas.user import CreditItemGet
-from rask_sdk.schemas.user import CreditsGet
+from typing import TYPE_CHECKING
+
+from rask_sdk.utils import lazy_module_getattr
+
+
+if TYPE_CHECKING:
+    from rask_sdk.schemas.glossary import GlossaryCreate
+    from rask_sdk.schemas.glossary import GlossaryGet
+    from rask_sdk.schemas.glossary import GlossaryIdGet
+    from rask_sdk.schemas.glossary import GlossaryUpdate
+    from rask_sdk.schemas.media import MediaCreateLink
+    from rask_sdk.schemas.media import MediaGet
+    from rask_sdk.schemas.project import CheckFaceTaskResponse
+    from rask_sdk.schemas.project import LipsyncInfo
+    from rask_sdk.schemas.project import LipsyncTaskData
+    from rask_sdk.schemas.project import LipsyncTaskResponse
+    from rask_sdk.schemas.project import ProjectCreate
+    from rask_sdk.schemas.project import ProjectGet
+    from rask_sdk.schemas.project import ProjectGetSlim
+    from rask_sdk.schemas.project import ProjectPatch
+    from rask_sdk.schemas.project import ProjectsGet
+    from rask_sdk.schemas.project import SegmentCreate
+    from rask_sdk.schemas.project import SegmentGet
+    from rask_sdk.schemas.project import SegmentId
+    from rask_sdk.schemas.project import SegmentPatch
+    from rask_sdk.schemas.project import SegmentTextCreatePatch
+    from rask_sdk.schemas.project import SegmentTextGet
+    from rask_sdk.schemas.project import TranscriptionCreate
+    from rask_sdk.schemas.project import TranscriptionGet
+    from rask_sdk.schemas.project import TranscriptionId
+    from rask_sdk.schemas.project import TranscriptionSegmentsCreate
+    from rask_sdk.schemas.project import TranscriptionSegmentsPatch
+    from rask_sdk.schemas.project import Voice
+    from rask_sdk.schemas.user import CreditItemGet
+    from rask_sdk.schemas.user import CreditsGet
 
 
 __all__ = [
@@ -54,3 +60,38 @@ __all__ = [
     "TranscriptionSegmentsPatch",
     "Voice",
 ]
+
+__getattr__ = lazy_module_getattr(
+    __name__,
+    {
+        "GlossaryCreate": "rask_sdk.schemas.glossary",
+        "GlossaryGet": "rask_sdk.schemas.glossary",
+        "GlossaryIdGet": "rask_sdk.schemas.glossary",
+        "GlossaryUpdate": "rask_sdk.schemas.glossary",
+        "MediaCreateLink": "rask_sdk.schemas.media",
+        "MediaGet": "rask_sdk.schemas.media",
+        "CheckFaceTaskResponse": "rask_sdk.schemas.project",
+        "LipsyncInfo": "rask_sdk.schemas.project",
+        "LipsyncTaskData": "rask_sdk.schemas.project",
+        "LipsyncTaskResponse": "rask_sdk.schemas.project",
+        "ProjectCreate": "rask_sdk.schemas.project",
+        "ProjectGet": "rask_sdk.schemas.project",
+        "ProjectGetSlim": "rask_sdk.schemas.project",
+        "ProjectPatch": "rask_sdk.schemas.project",
+        "ProjectsGet": "rask_sdk.schemas.project",
+        "SegmentCreate": "rask_sdk.schemas.project",
+        "SegmentGet": "rask_sdk.schemas.project",
+        "SegmentId": "rask_sdk.schemas.project",
+        "SegmentPatch": "rask_sdk.schemas.project",
+        "SegmentTextCreatePatch": "rask_sdk.schemas.project",
+        "SegmentTextGet": "rask_sdk.schemas.project",
+        "TranscriptionCreate": "rask_sdk.schemas.project",
+        "TranscriptionGet": "rask_sdk.schemas.project",
+        "TranscriptionId": "rask_sdk.schemas.project",
+        "TranscriptionSegmentsCreate": "rask_sdk.schemas.project",
+        "TranscriptionSegmentsPatch": "rask_sdk.schemas.project",
+        "Voice": "rask_sdk.schemas.project",
+        "CreditItemGet": "rask_sdk.schemas.user",
+        "CreditsGet": "rask_sdk.schemas.user",
+    },
+)
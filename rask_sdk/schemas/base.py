@@ -0,0 +1,7 @@
+import pydantic
+
+
+class BaseSchema(pydantic.BaseModel):
+    """Base schema deferring validator construction until the model is first used."""
+
+    model_config = pydantic.ConfigDict(defer_build=True)
@@ -4,6 +4,7 @@ from typing import Dict
 from typing import Optional
 
 import pydantic
+from rask_sdk.schemas.base import BaseSchema
 
 
 MAX_WORD_SIZE = 1024  # 1024bytes
@@ -57,7 +58,7 @@ def validate_entries(
     return entries
 
 
-class GlossaryCreate(pydantic.BaseModel):
+class GlossaryCreate(BaseSchema):
     name: str
     src_lang: str
     dst_lang: str
@@ -74,7 +75,7 @@ class GlossaryCreate(pydantic.BaseModel):
         return value.strip()
 
 
-class GlossaryUpdate(pydantic.BaseModel):
+class GlossaryUpdate(BaseSchema):
     name: str
     entries: Dict[str, str]
 
@@ -89,7 +90,7 @@ class GlossaryUpdate(pydantic.BaseModel):
         return value.strip()
 
 
-class GlossaryGet(pydantic.BaseModel):
+class GlossaryGet(BaseSchema):
     id: uuid.UUID
     name: str
     version: int
@@ -98,5 +99,5 @@ class GlossaryGet(pydantic.BaseModel):
     entries: Dict[str, str]
 
 
-class GlossaryIdGet(pydantic.BaseModel):
+class GlossaryIdGet(BaseSchema):
     id: uuid.UUID
@@ -7,9 +7,10 @@ from typing import Union
 
 import pydantic
 from rask_sdk import enums
+from rask_sdk.schemas.base import BaseSchema
 
 
-class MetaBase(pydantic.BaseModel):
+class MetaBase(BaseSchema):
     size_bytes: pydantic.StrictInt
     original_meta: Optional[None] = None
 
@@ -35,7 +36,7 @@ class ImageMeta(MetaBase):
     image_format: pydantic.StrictStr
 
 
-class MediaBase(pydantic.BaseModel):
+class MediaBase(BaseSchema):
     id: uuid.UUID
     user_id: uuid.UUID
     preview_id: Optional[uuid.UUID] = None
@@ -51,7 +52,7 @@ class MediaBase(pydantic.BaseModel):
     deleted_at: Optional[datetime.datetime] = None
 
 
-class MediaCreateLink(pydantic.BaseModel):
+class MediaCreateLink(BaseSchema):
     link: pydantic.AnyUrl
     kind: Optional[enums.MediaKind] = None
     name: Optional[str] = None
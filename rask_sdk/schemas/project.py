@@ -6,6 +6,7 @@ from typing import Optional
 
 import pydantic
 from rask_sdk import enums
+from rask_sdk.schemas.base import BaseSchema
 
 
 TIMESTAMP_FORMAT = "%H:%M:%S,%f"
@@ -46,7 +47,7 @@ def validate_speaker(speaker: Optional[str]) -> None:
         )
 
 
-class ProjectGetSlim(pydantic.BaseModel):
+class ProjectGetSlim(BaseSchema):
     id: uuid.UUID
     name: str
     source_type: enums.ProjectSourceType
@@ -75,13 +76,13 @@ class ProjectGet(ProjectGetSlim):
     translation_vtt_path: Optional[str] = None
 
 
-class ProjectsGet(pydantic.BaseModel):
+class ProjectsGet(BaseSchema):
     total: int
     offset: int
     projects: List[ProjectGetSlim]
 
 
-class ProjectCreate(pydantic.BaseModel):
+class ProjectCreate(BaseSchema):
     video_id: uuid.UUID
     name: Optional[str] = None
     src_lang: Optional[str] = None
@@ -91,7 +92,7 @@ class ProjectCreate(pydantic.BaseModel):
     glossary_id: Optional[uuid.UUID] = None
 
 
-class ProjectPatch(pydantic.BaseModel):
+class ProjectPatch(BaseSchema):
     name: Optional[str] = None
     num_speakers: Optional[int] = None
     voice: Optional[Dict[str, uuid.UUID]] = None
@@ -111,19 +112,19 @@ class ProjectPatch(pydantic.BaseModel):
         return values
 
 
-class Voice(pydantic.BaseModel):
+class Voice(BaseSchema):
     id: uuid.UUID
     label: str
     sample_src: Optional[str] = None
     gender: str
 
 
-class SegmentTextCreatePatch(pydantic.BaseModel):
+class SegmentTextCreatePatch(BaseSchema):
     text: str
     lang: str
 
 
-class SegmentCreate(pydantic.BaseModel):
+class SegmentCreate(BaseSchema):
     src: Optional[SegmentTextCreatePatch] = None
     dst: Optional[SegmentTextCreatePatch] = None
     speaker: Optional[str] = None
@@ -164,7 +165,7 @@ class SegmentCreate(pydantic.BaseModel):
         return values
 
 
-class TranscriptionCreate(pydantic.BaseModel):
+class TranscriptionCreate(BaseSchema):
     segments: List[SegmentCreate]
 
     @pydantic.model_validator(mode="after")
@@ -182,12 +183,12 @@ class TranscriptionCreate(pydantic.BaseModel):
         return self
 
 
-class SegmentTextGet(pydantic.BaseModel):
+class SegmentTextGet(BaseSchema):
     text: str
     lang: Optional[str] = None
 
 
-class SegmentGet(pydantic.BaseModel):
+class SegmentGet(BaseSchema):
     id: uuid.UUID
     src: Optional[SegmentTextGet] = None
     dst: Optional[SegmentTextGet] = None
@@ -197,7 +198,7 @@ class SegmentGet(pydantic.BaseModel):
     status: enums.SegmentStatus
 
 
-class SegmentPatch(pydantic.BaseModel):
+class SegmentPatch(BaseSchema):
     id: uuid.UUID
     src: Optional[SegmentTextCreatePatch] = None
     dst: Optional[SegmentTextCreatePatch] = None
@@ -244,11 +245,11 @@ class SegmentPatch(pydantic.BaseModel):
         return values
 
 
-class SegmentId(pydantic.BaseModel):
+class SegmentId(BaseSchema):
     id: uuid.UUID
 
 
-class TranscriptionGet(pydantic.BaseModel):
+class TranscriptionGet(BaseSchema):
     segments: List[SegmentGet]
 
 
@@ -256,29 +257,29 @@ class TranscriptionId(TranscriptionGet):
     id: uuid.UUID
 
 
-class TranscriptionSegmentsCreate(pydantic.BaseModel):
+class TranscriptionSegmentsCreate(BaseSchema):
     segments: List[SegmentCreate]
 
 
-class TranscriptionSegmentsPatch(pydantic.BaseModel):
+class TranscriptionSegmentsPatch(BaseSchema):
     segments: List[SegmentPatch]
 
 
-class CheckFaceTaskResponse(pydantic.BaseModel):
+class CheckFaceTaskResponse(BaseSchema):
     check_face_task_status: Optional[enums.LipsyncStatus] = None
 
 
-class LipsyncTaskData(pydantic.BaseModel):
+class LipsyncTaskData(BaseSchema):
     is_multiple_speakers: Optional[bool] = None
     is_free_lipsync: Optional[bool] = None
 
 
-class LipsyncTaskResponse(pydantic.BaseModel):
+class LipsyncTaskResponse(BaseSchema):
     tasks_in_lipsync_queue: Optional[int] = None
     lipsync_task_status: Optional[enums.LipsyncStatus] = None
 
 
-class LipsyncInfo(pydantic.BaseModel):
+class LipsyncInfo(BaseSchema):
     check_face_task_status: Optional[enums.LipsyncStatus] = None
     tasks_in_lipsync_queue: Optional[int] = None
     lipsync_result_path: Optional[str] = None
@@ -1,12 +1,12 @@
-import pydantic
+from rask_sdk.schemas.base import BaseSchema
 
 
-class CreditItemGet(pydantic.BaseModel):
+class CreditItemGet(BaseSchema):
     total: int
     used: int
 
 
-class CreditsGet(pydantic.BaseModel):
+class CreditsGet(BaseSchema):
     minutes: CreditItemGet
     video: CreditItemGet
     lipsync_free_minutes: CreditItemGet
@@ -0,0 +1,8 @@
+from rask_sdk.storage.journal import JobJournal
+from rask_sdk.storage.journal import JournalEntry
+from rask_sdk.storage.transcripts import TranscriptIndex
+from rask_sdk.storage.transcripts import TranscriptMatch
+from rask_sdk.storage.uploads import UploadIndex
+
+
+__all__ = ["JobJournal", "JournalEntry", "TranscriptIndex", "TranscriptMatch", "UploadIndex"]
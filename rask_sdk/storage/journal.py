@@ -0,0 +1,142 @@
+import dataclasses
+import os
+import sqlite3
+import uuid
+from typing import List
+from typing import Optional
+from typing import Union
+
+from rask_sdk import enums
+
+
+STAGES = list(enums.DubbingStage)
+
+
+@dataclasses.dataclass
+class JournalEntry:
+    """Steps of a job recorded so far."""
+
+    key: str
+    stage: enums.DubbingStage
+    media_id: Optional[uuid.UUID] = None
+    project_id: Optional[uuid.UUID] = None
+    # ``status_updated_at`` of the project when its generation has been requested
+    generate_from: Optional[float] = None
+
+    def reached(self, stage: enums.DubbingStage) -> bool:
+        """Whether the step of the stage has been completed."""
+
+        return STAGES.index(self.stage) >= STAGES.index(stage)
+
+
+class JobJournal:
+    """Local SQLite journal of completed job steps.
+
+    Every step is committed as soon as it is completed along with ids it has resulted in, so
+    a job run again after a crash continues from the last recorded step rather than from
+    scratch. A step interrupted before being recorded is done again, unless its intent has
+    been recorded beforehand to be checked on resume.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """."""
+
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "key TEXT PRIMARY KEY, "
+            "stage TEXT NOT NULL, "
+            "media_id TEXT, "
+            "project_id TEXT, "
+            "generate_from REAL)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def _entry(row: tuple) -> JournalEntry:
+        key, stage, media_id, project_id, generate_from = row
+
+        return JournalEntry(
+            key=key,
+            stage=enums.DubbingStage(stage),
+            media_id=uuid.UUID(media_id) if media_id is not None else None,
+            project_id=uuid.UUID(project_id) if project_id is not None else None,
+            generate_from=generate_from,
+        )
+
+    def get(self, key: str) -> Optional[JournalEntry]:
+        """Get steps recorded for the job."""
+
+        row = self._connection.execute(
+            "SELECT key, stage, media_id, project_id, generate_from FROM jobs WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        return self._entry(row) if row is not None else None
+
+    def entries(self) -> List[JournalEntry]:
+        """Get steps recorded for every job."""
+
+        return [
+            self._entry(row)
+            for row in self._connection.execute(
+                "SELECT key, stage, media_id, project_id, generate_from FROM jobs "
+                "ORDER BY rowid"
+            )
+        ]
+
+    def record(
+        self,
+        key: str,
+        stage: enums.DubbingStage,
+        media_id: Optional[uuid.UUID] = None,
+        project_id: Optional[uuid.UUID] = None,
+        generate_from: Optional[float] = None,
+    ) -> None:
+        """Record the completed step of the job, keeping ids recorded by previous steps.
+
+        The recorded stage never moves back, so recording a step the job has already gone
+        past only adds the ids.
+        """
+
+        entry = self.get(key=key)
+        if entry is not None and entry.reached(stage):
+            stage = entry.stage
+
+        self._connection.execute(
+            "INSERT INTO jobs (key, stage, media_id, project_id, generate_from) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET stage = excluded.stage, "
+            "media_id = COALESCE(excluded.media_id, media_id), "
+            "project_id = COALESCE(excluded.project_id, project_id), "
+            "generate_from = COALESCE(excluded.generate_from, generate_from)",
+            (
+                key,
+                stage.value,
+                str(media_id) if media_id is not None else None,
+                str(project_id) if project_id is not None else None,
+                generate_from,
+            ),
+        )
+        self._connection.commit()
+
+    def reset_project(self, key: str) -> None:
+        """Forget the project of the job, keeping its media, so the project is created again."""
+
+        self._connection.execute(
+            "UPDATE jobs SET stage = ?, project_id = NULL, generate_from = NULL "
+            "WHERE key = ?",
+            (enums.DubbingStage.UPLOAD.value, key),
+        )
+        self._connection.commit()
+
+    def delete(self, key: str) -> None:
+        """Forget steps recorded for the job."""
+
+        self._connection.execute("DELETE FROM jobs WHERE key = ?", (key,))
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        self._connection.close()
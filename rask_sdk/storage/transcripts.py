@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import os
+import re
+import sqlite3
+import uuid
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+from rask_sdk import schemas
+
+
+TERM_PATTERN = re.compile(r"\w+")
+SEGMENT_SIDES = ("src", "dst")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case insensitive terms."""
+
+    return TERM_PATTERN.findall(text.casefold())
+
+
+def timestamp_seconds(timestamp: str) -> float:
+    """Offset in seconds of a ``HH:MM:SS,mmm`` segment timestamp."""
+
+    clock, _, fraction = timestamp.partition(",")
+    hours, minutes, seconds = clock.split(":")
+
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + float(f"0.{fraction or 0}")
+
+
+@dataclasses.dataclass
+class TranscriptMatch:
+    """Transcription segment matching a search query."""
+
+    project_id: uuid.UUID
+    segment_id: uuid.UUID
+    side: str
+    lang: Optional[str]
+    text: str
+    start: str
+    end: str
+
+    @property
+    def start_seconds(self) -> float:
+        return timestamp_seconds(self.start)
+
+    @property
+    def end_seconds(self) -> float:
+        return timestamp_seconds(self.end)
+
+
+class TranscriptIndex:
+    """Local SQLite inverted index of project transcriptions.
+
+    Source and translated text of every segment is split into terms, stored with their
+    positions, so both terms and phrases are looked up without scanning the text. Every
+    project is stored along with ``status_updated_at`` it has been indexed at, so it is
+    indexed again only once its status has changed.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"] = ":memory:") -> None:
+        """."""
+
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS projects ("
+            "project_id TEXT PRIMARY KEY, "
+            "status_updated_at REAL);"
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "id INTEGER PRIMARY KEY, "
+            "project_id TEXT NOT NULL, "
+            "segment_id TEXT NOT NULL, "
+            "side TEXT NOT NULL, "
+            "lang TEXT, "
+            "text TEXT NOT NULL, "
+            "start_timestamp TEXT NOT NULL, "
+            "end_timestamp TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS segments_project_id ON segments (project_id);"
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, "
+            "segment INTEGER NOT NULL, "
+            "position INTEGER NOT NULL, "
+            "PRIMARY KEY (term, segment, position)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS postings_segment ON postings (segment);"
+        )
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def versions(self) -> Dict[uuid.UUID, Optional[float]]:
+        """Get ``status_updated_at`` timestamps of indexed projects."""
+
+        return {
+            uuid.UUID(project_id): status_updated_at
+            for project_id, status_updated_at in self._connection.execute(
+                "SELECT project_id, status_updated_at FROM projects"
+            )
+        }
+
+    def is_stale(self, project: schemas.ProjectGetSlim) -> bool:
+        """Whether the project has not been indexed since its status has changed."""
+
+        row = self._connection.execute(
+            "SELECT status_updated_at FROM projects WHERE project_id = ?", (str(project.id),)
+        ).fetchone()
+
+        return row is None or row[0] != self._version(project.status_updated_at)
+
+    @staticmethod
+    def _version(status_updated_at: Optional[datetime.datetime]) -> Optional[float]:
+        return status_updated_at.timestamp() if status_updated_at is not None else None
+
+    def _delete(self, project_id: uuid.UUID) -> None:
+        self._connection.execute(
+            "DELETE FROM postings WHERE segment IN "
+            "(SELECT id FROM segments WHERE project_id = ?)",
+            (str(project_id),),
+        )
+        self._connection.execute(
+            "DELETE FROM segments WHERE project_id = ?", (str(project_id),)
+        )
+        self._connection.execute(
+            "DELETE FROM projects WHERE project_id = ?", (str(project_id),)
+        )
+
+    def set(
+        self,
+        project_id: uuid.UUID,
+        segments: Iterable[schemas.SegmentGet],
+        status_updated_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Replace indexed segments of the project."""
+
+        with self._connection:
+            self._delete(project_id=project_id)
+            self._connection.execute(
+                "INSERT INTO projects (project_id, status_updated_at) VALUES (?, ?)",
+                (str(project_id), self._version(status_updated_at)),
+            )
+
+            for segment in segments:
+                for side in SEGMENT_SIDES:
+                    segment_text: Optional[schemas.SegmentTextGet] = getattr(segment, side)
+                    if segment_text is None or not segment_text.text:
+                        continue
+
+                    cursor = self._connection.execute(
+                        "INSERT INTO segments (project_id, segment_id, side, lang, text, "
+                        "start_timestamp, end_timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            str(project_id),
+                            str(segment.id),
+                            side,
+                            segment_text.lang,
+                            segment_text.text,
+                            segment.start,
+                            segment.end,
+                        ),
+                    )
+                    self._connection.executemany(
+                        "INSERT OR IGNORE INTO postings (term, segment, position) "
+                        "VALUES (?, ?, ?)",
+                        (
+                            (term, cursor.lastrowid, position)
+                            for position, term in enumerate(tokenize(segment_text.text))
+                        ),
+                    )
+
+    def delete(self, project_id: uuid.UUID) -> None:
+        """Remove the project from the index."""
+
+        with self._connection:
+            self._delete(project_id=project_id)
+
+    def search(
+        self,
+        query: str,
+        lang: Optional[str] = None,
+        side: Optional[str] = None,
+        phrase: bool = True,
+        limit: int = 100,
+    ) -> List[TranscriptMatch]:
+        """Find segments containing every term of the query.
+
+        Terms should follow each other in the query order unless ``phrase`` is disabled.
+        ``lang`` matches regional variants as well, e.g. ``en`` matches ``en-us``, and
+        ``side`` is either ``src`` or ``dst`` to search only source or translated text.
+        """
+
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        joins = []
+        params: List[Union[str, int]] = []
+        for offset, term in enumerate(terms[1:], start=1):
+            position = f" AND p{offset}.position = p0.position + {offset}" if phrase else ""
+            joins.append(
+                f"JOIN postings p{offset} ON p{offset}.term = ? "
+                f"AND p{offset}.segment = p0.segment{position}"
+            )
+            params.append(term)
+
+        conditions = ["p0.term = ?"]
+        params.append(terms[0])
+        if lang is not None:
+            conditions.append("(s.lang = ? OR s.lang LIKE ?)")
+            params.extend((lang, f"{lang}-%"))
+        if side is not None:
+            conditions.append("s.side = ?")
+            params.append(side)
+
+        params.append(limit)
+        rows = self._connection.execute(
+            "SELECT DISTINCT s.id, s.project_id, s.segment_id, s.side, s.lang, s.text, "
+            "s.start_timestamp, s.end_timestamp "
+            f"FROM postings p0 {' '.join(joins)} "
+            "JOIN segments s ON s.id = p0.segment "
+            f"WHERE {' AND '.join(conditions)} "
+            "ORDER BY s.id LIMIT ?",
+            params,
+        ).fetchall()
+
+        return [
+            TranscriptMatch(
+                project_id=uuid.UUID(project_id),
+                segment_id=uuid.UUID(segment_id),
+                side=side_,
+                lang=lang_,
+                text=text,
+                start=start,
+                end=end,
+            )
+            for _id, project_id, segment_id, side_, lang_, text, start, end in rows
+        ]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        self._connection.close()
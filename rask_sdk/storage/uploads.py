@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import sqlite3
+import uuid
+from typing import Dict
+from typing import Optional
+from typing import Union
+
+from rask_sdk import enums
+from rask_sdk.clients.uploads import UploadSource
+
+
+HASH_CHUNK_SIZE = 1048576  # 1mb
+
+
+def hash_file(file: UploadSource) -> str:
+    """Compute sha256 digest of the file or buffer content, restoring file position."""
+
+    if isinstance(file, (bytes, bytearray, memoryview, mmap.mmap)):
+        return hashlib.sha256(memoryview(file)).hexdigest()
+
+    if hasattr(file, "__aiter__"):
+        raise ValueError("Async iterators can not be hashed before being uploaded.")
+
+    position = file.tell()
+    digest = hashlib.sha256()
+
+    try:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    finally:
+        file.seek(position)
+
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    """Local SQLite index mapping media content hashes to uploaded media ids."""
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"] = ":memory:") -> None:
+        """."""
+
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS uploads ("
+            "digest TEXT NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "media_id TEXT NOT NULL, "
+            "PRIMARY KEY (digest, kind))"
+        )
+        self._connection.commit()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _kind(kind: Optional[enums.MediaKind]) -> str:
+        return kind.value if kind is not None else ""
+
+    async def hash_file(self, file: UploadSource) -> str:
+        """Hash the file in a worker thread not to block the event loop."""
+
+        return await asyncio.get_running_loop().run_in_executor(None, hash_file, file)
+
+    def lock(self, digest: str) -> asyncio.Lock:
+        """Get the lock serializing concurrent uploads of the same content."""
+
+        if digest not in self._locks:
+            self._locks[digest] = asyncio.Lock()
+
+        return self._locks[digest]
+
+    def get(self, digest: str, kind: Optional[enums.MediaKind] = None) -> Optional[uuid.UUID]:
+        """Get id of the media uploaded with the content hash provided."""
+
+        row = self._connection.execute(
+            "SELECT media_id FROM uploads WHERE digest = ? AND kind = ?",
+            (digest, self._kind(kind)),
+        ).fetchone()
+
+        return uuid.UUID(row[0]) if row is not None else None
+
+    def set(
+        self, digest: str, media_id: uuid.UUID, kind: Optional[enums.MediaKind] = None
+    ) -> None:
+        """Remember the media uploaded with the content hash provided."""
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO uploads (digest, kind, media_id) VALUES (?, ?, ?)",
+            (digest, self._kind(kind), str(media_id)),
+        )
+        self._connection.commit()
+
+    def delete(self, digest: str, kind: Optional[enums.MediaKind] = None) -> None:
+        """Forget the media uploaded with the content hash provided."""
+
+        self._connection.execute(
+            "DELETE FROM uploads WHERE digest = ? AND kind = ?", (digest, self._kind(kind))
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+
+        self._connection.close()
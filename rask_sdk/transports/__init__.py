@@ -0,0 +1,12 @@
+from rask_sdk.transports.cassette import Interaction
+from rask_sdk.transports.cassette import RecordingTransport
+from rask_sdk.transports.cassette import ReplayTransport
+from rask_sdk.transports.cassette import load_cassette
+
+
+__all__ = [
+    "Interaction",
+    "RecordingTransport",
+    "ReplayTransport",
+    "load_cassette",
+]
@@ -0,0 +1,281 @@
+import asyncio
+import base64
+import dataclasses
+import json
+import os
+import random
+import re
+import time
+from collections import defaultdict
+from typing import IO
+from typing import Callable
+from typing import DefaultDict
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import httpx
+
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+# Headers describing the encoded body on the wire, which is stored decoded
+SKIPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+# Fields of token exchange responses which are replaced before being recorded
+REDACTED_FIELDS = frozenset({"access_token", "refresh_token", "id_token"})
+REDACTED = "REDACTED"
+
+
+@dataclasses.dataclass
+class Interaction:
+    """Recorded request / response pair."""
+
+    method: str
+    url: str
+    status_code: int
+    headers: List[Tuple[str, str]]
+    content: bytes
+    elapsed: float
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.method, self.url
+
+    @property
+    def template_key(self) -> Tuple[str, str]:
+        return self.method, UUID_PATTERN.sub("{id}", self.url)
+
+    def to_json(self) -> str:
+        try:
+            body = {"body": self.content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"body_base64": base64.b64encode(self.content).decode("ascii")}
+
+        return json.dumps(
+            {
+                "method": self.method,
+                "url": self.url,
+                "status_code": self.status_code,
+                "headers": self.headers,
+                "elapsed": self.elapsed,
+                **body,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "Interaction":
+        data = json.loads(line)
+        if "body_base64" in data:
+            content = base64.b64decode(data["body_base64"])
+        else:
+            content = data.get("body", "").encode("utf-8")
+
+        return cls(
+            method=data["method"],
+            url=data["url"],
+            status_code=data["status_code"],
+            headers=[(name, value) for name, value in data["headers"]],
+            content=content,
+            elapsed=data["elapsed"],
+        )
+
+
+def redact(content: bytes) -> bytes:
+    """Replace tokens of a JSON object response body."""
+
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+
+    if not isinstance(data, dict) or not REDACTED_FIELDS & data.keys():
+        return content
+
+    return json.dumps(
+        {name: REDACTED if name in REDACTED_FIELDS else value for name, value in data.items()}
+    ).encode("utf-8")
+
+
+def load_cassette(path: Union[str, "os.PathLike[str]"]) -> List[Interaction]:
+    """Load interactions recorded into the cassette file."""
+
+    with open(path, "r", encoding="utf-8") as cassette:
+        return [Interaction.from_json(line) for line in cassette if line.strip()]
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport recording every request / response pair into a cassette file.
+
+    Cassettes are JSON lines files with one interaction per line, appended as soon as the
+    response is received. Request headers and bodies, which carry credentials, are never
+    stored, and tokens issued by token exchange responses are redacted.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """."""
+
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self._cassette: IO[str] = open(path, "a", encoding="utf-8")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+
+        # Body is read decoded, so its encoding headers are not recorded
+        content = await response.aread()
+        await response.aclose()
+
+        interaction = Interaction(
+            method=request.method,
+            url=str(request.url.copy_with(fragment=None)),
+            status_code=response.status_code,
+            headers=[
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            ],
+            content=redact(content),
+            elapsed=time.monotonic() - started_at,
+        )
+        self._cassette.write(interaction.to_json() + "\n")
+        self._cassette.flush()
+
+        # Live client still gets the tokens which have been redacted in the cassette
+        return httpx.Response(
+            status_code=interaction.status_code,
+            headers=interaction.headers,
+            content=content,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        self._cassette.close()
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport answering requests with interactions recorded into a cassette.
+
+    Requests are matched by method and URL, falling back to the URL with every id replaced
+    by a placeholder, so recorded traffic can be replayed for other projects as well.
+    Interactions matching a request are returned in turn, cycling when exhausted.
+
+    Recorded latency is scaled by ``speed`` (``2.0`` replays twice as fast, ``0`` without
+    any delay), ``latency`` adds extra seconds drawn for every request, a fraction
+    ``error_rate`` of requests fails with one of ``error_statuses`` and ``max_concurrency``
+    limits requests processed at once to mimic server capacity.
+    """
+
+    def __init__(
+        self,
+        interactions: Sequence[Interaction],
+        speed: float = 1.0,
+        latency: Optional[Callable[[], float]] = None,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (503,),
+        max_concurrency: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """."""
+
+        self._speed = speed
+        self._latency = latency
+        self._error_rate = error_rate
+        self._error_statuses = error_statuses
+        self._max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._random = random.Random(seed)
+
+        self._interactions: DefaultDict[Tuple[str, str], List[Interaction]] = defaultdict(list)
+        self._templates: DefaultDict[Tuple[str, str], List[Interaction]] = defaultdict(list)
+        for interaction in interactions:
+            self._interactions[interaction.key].append(interaction)
+            self._templates[interaction.template_key].append(interaction)
+
+        self._turns: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    @classmethod
+    def from_cassette(
+        cls, path: Union[str, "os.PathLike[str]"], **kwargs
+    ) -> "ReplayTransport":
+        """Create transport replaying the cassette file."""
+
+        return cls(interactions=load_cassette(path), **kwargs)
+
+    def _match(self, request: httpx.Request) -> Optional[Interaction]:
+        url = str(request.url.copy_with(fragment=None))
+        key = (request.method, url)
+        candidates = self._interactions.get(key)
+
+        if not candidates:
+            key = (request.method, UUID_PATTERN.sub("{id}", url))
+            candidates = self._templates.get(key)
+
+        if not candidates:
+            return None
+
+        turn = self._turns[key]
+        self._turns[key] = turn + 1
+        interaction = candidates[turn % len(candidates)]
+
+        if interaction.url == url:
+            return interaction
+
+        # Matched by template, so ids of the recorded URL are replaced with requested ones
+        content = interaction.content
+        for recorded_id, requested_id in zip(
+            UUID_PATTERN.findall(interaction.url), UUID_PATTERN.findall(url)
+        ):
+            content = content.replace(recorded_id.encode(), requested_id.encode())
+
+        return dataclasses.replace(interaction, url=url, content=content)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._max_concurrency is not None and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        if self._semaphore is None:
+            return await self._replay(request=request)
+
+        async with self._semaphore:
+            return await self._replay(request=request)
+
+    async def _replay(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._match(request=request)
+
+        delay = interaction.elapsed / self._speed if interaction and self._speed > 0 else 0.0
+        if self._latency is not None:
+            delay += self._latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._error_rate > 0 and self._random.random() < self._error_rate:
+            return httpx.Response(
+                status_code=self._random.choice(self._error_statuses),
+                json={"detail": "Injected error."},
+                request=request,
+            )
+
+        if interaction is None:
+            return httpx.Response(
+                status_code=404,
+                json={
+                    "detail": f"No recorded interaction for {request.method} {request.url}."
+                },
+                request=request,
+            )
+
+        return httpx.Response(
+            status_code=interaction.status_code,
+            headers=interaction.headers,
+            content=interaction.content,
+            request=request,
+        )
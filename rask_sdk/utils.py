@@ -1,21 +1,97 @@
+import contextlib
+import contextvars
 import functools
+import importlib
+import time
+from http import HTTPStatus
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import Optional
 
-from authlib.integrations.base_client import MissingRequestTokenError  # type: ignore[import-untyped]
-from authlib.integrations.base_client import MissingTokenError
-from authlib.integrations.base_client import TokenExpiredError
+from rask_sdk.exceptions.base import RaskTimeoutException
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "rask_sdk_deadline", default=None
+)
+
+
+def lazy_module_getattr(package: str, attrs: Dict[str, str]) -> Callable[[str], Any]:
+    """Build a module level ``__getattr__`` importing public names on first access."""
+
+    def __getattr__(name: str) -> Any:
+        module_path = attrs.get(name)
+        if module_path is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_path), name)
+        setattr(importlib.import_module(package), name, value)
+
+        return value
+
+    return __getattr__
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Limit time of every client call made within the block, retries and re-auth included.
+
+    Nested deadlines can only shorten the outer one. Calls still running when the deadline
+    expires are cancelled and raise ``RaskTimeoutException``.
+    """
+
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(min(expires_at, outer) if outer is not None else expires_at)
+
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left until the current deadline, if any."""
+
+    expires_at = _deadline.get()
+
+    return max(expires_at - time.monotonic(), 0.0) if expires_at is not None else None
 
 
 def retry_on_auth_error():
-    """Authenticate and retry once on missing or expired token."""
+    """Authenticate and retry once on missing or expired token, within the current deadline."""
 
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(instance, *args, **kwargs):
+            import asyncio
+
+            from authlib.integrations.base_client import (  # type: ignore[import-untyped]
+                MissingRequestTokenError,
+            )
+            from authlib.integrations.base_client import MissingTokenError
+            from authlib.integrations.base_client import TokenExpiredError
+
+            async def call():
+                try:
+                    return await func(instance, *args, **kwargs)
+                except (MissingTokenError, MissingRequestTokenError, TokenExpiredError):
+                    await instance.authenticate()
+                    return await func(instance, *args, **kwargs)
+
+            timeout = remaining_time()
+            if timeout is None:
+                return await call()
+
             try:
-                return await func(instance, *args, **kwargs)
-            except (MissingTokenError, MissingRequestTokenError, TokenExpiredError):
-                await instance.authenticate()
-                return await func(instance, *args, **kwargs)
+                return await asyncio.wait_for(call(), timeout=timeout)
+            except asyncio.TimeoutError as exc:
+                raise RaskTimeoutException(
+                    status_code=HTTPStatus.REQUEST_TIMEOUT,
+                    detail=f"Deadline exceeded calling {func.__name__}.",
+                ) from exc
 
         return wrapper
 
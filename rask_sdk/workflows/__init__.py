@@ -0,0 +1,34 @@
+from rask_sdk.workflows.change_feed import ProjectChange
+from rask_sdk.workflows.change_feed import ProjectChangeFeed
+from rask_sdk.workflows.credits import CreditAdmission
+from rask_sdk.workflows.credits import CreditReservation
+from rask_sdk.workflows.dubbing import DubbingJob
+from rask_sdk.workflows.dubbing import DubbingJobResult
+from rask_sdk.workflows.dubbing import DubbingPipeline
+from rask_sdk.workflows.lipsync import LipsyncJobResult
+from rask_sdk.workflows.lipsync import LipsyncScheduler
+from rask_sdk.workflows.transcripts import TranscriptIndexer
+from rask_sdk.workflows.transcripts import TranscriptIndexRefresh
+from rask_sdk.workflows.voices import VoiceAssigner
+from rask_sdk.workflows.voices import VoiceAssignmentResult
+from rask_sdk.workflows.voices import VoicePolicy
+from rask_sdk.workflows.voices import voices_by_label
+
+
+__all__ = [
+    "CreditAdmission",
+    "CreditReservation",
+    "DubbingJob",
+    "DubbingJobResult",
+    "DubbingPipeline",
+    "LipsyncJobResult",
+    "LipsyncScheduler",
+    "ProjectChange",
+    "ProjectChangeFeed",
+    "TranscriptIndexRefresh",
+    "TranscriptIndexer",
+    "VoiceAssigner",
+    "VoiceAssignmentResult",
+    "VoicePolicy",
+    "voices_by_label",
+]
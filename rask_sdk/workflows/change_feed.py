@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import inspect
+import uuid
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from rask_sdk import enums
+from rask_sdk import schemas
+from rask_sdk.clients.rask_client import RaskSDKClient
+
+
+@dataclasses.dataclass
+class ProjectChange:
+    """Project whose status has changed since the previous sweep."""
+
+    project: schemas.ProjectGetSlim
+    previous_status: Optional[enums.ProjectStatus] = None
+    is_new: bool = False
+
+
+class ProjectChangeFeed:
+    """Track status of all projects by sweeping project list pages.
+
+    Only ``status`` and ``status_updated_at`` of every project are kept between sweeps, and
+    only projects where either of them has changed are emitted, so monitoring costs one
+    request per page rather than one per project. The first sweep just fills the snapshot
+    unless ``emit_initial`` is set.
+    """
+
+    def __init__(
+        self,
+        client: RaskSDKClient,
+        interval: float = 60.0,
+        page_size: int = 100,
+        concurrency: int = 4,
+        name: Optional[str] = None,
+        emit_initial: bool = False,
+    ) -> None:
+        """."""
+
+        self._client = client
+        self._interval = interval
+        self._page_size = page_size
+        self._concurrency = concurrency
+        self._name = name
+        self._emit_initial = emit_initial
+        self._snapshot: Dict[uuid.UUID, Tuple[Optional[str], Optional[float]]] = {}
+        self._swept = False
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def _diff(self, project: schemas.ProjectGetSlim) -> Optional[ProjectChange]:
+        """Update the snapshot with the project returning its change if any."""
+
+        state = (
+            project.status.value if project.status is not None else None,
+            project.status_updated_at.timestamp() if project.status_updated_at else None,
+        )
+        previous = self._snapshot.get(project.id)
+        self._snapshot[project.id] = state
+
+        if previous == state:
+            return None
+
+        if previous is None:
+            if not self._swept and not self._emit_initial:
+                return None
+
+            return ProjectChange(project=project, is_new=True)
+
+        previous_status = enums.ProjectStatus(previous[0]) if previous[0] is not None else None
+
+        return ProjectChange(project=project, previous_status=previous_status)
+
+    async def iter_sweep(self) -> AsyncIterator[ProjectChange]:
+        """Sweep all project pages once yielding changes page by page."""
+
+        async for project in self._client.iter_projects(
+            page_size=self._page_size, concurrency=self._concurrency, name=self._name
+        ):
+            change = self._diff(project=project)
+            if change is not None:
+                yield change
+
+        self._swept = True
+
+    async def sweep(self) -> List[ProjectChange]:
+        """Sweep all project pages once returning changed projects."""
+
+        return [change async for change in self.iter_sweep()]
+
+    async def changes(self) -> AsyncIterator[ProjectChange]:
+        """Sweep projects every ``interval`` seconds yielding changes forever."""
+
+        while True:
+            async for change in self.iter_sweep():
+                yield change
+
+            await asyncio.sleep(self._interval)
+
+    async def run(
+        self, callback: Callable[[ProjectChange], Union[Awaitable[None], None]]
+    ) -> None:
+        """Sweep projects forever calling the callback for every change."""
+
+        async for change in self.changes():
+            outcome = callback(change)
+            if inspect.isawaitable(outcome):
+                await outcome
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Optional
+
+from rask_sdk import enums
+from rask_sdk import schemas
+from rask_sdk.clients.rask_client import RaskSDKClient
+from rask_sdk.exceptions.base import RaskJobException
+
+
+def duration_minutes(duration_seconds: int) -> int:
+    """Minutes charged for the duration, rounded up."""
+
+    return max(math.ceil(duration_seconds / 60), 1)
+
+
+def media_duration(media: schemas.MediaGet) -> Optional[int]:
+    """Duration of the media in seconds, if it is already known."""
+
+    if isinstance(media.meta, dict):
+        duration = media.meta.get("duration_seconds")
+    else:
+        duration = getattr(media.meta, "duration_seconds", None)
+
+    return duration if isinstance(duration, int) else None
+
+
+class CreditReservation:
+    """Minutes reserved for a single job.
+
+    The reservation should be committed once the job has been charged or released if it has
+    failed before, releasing a committed reservation does nothing.
+    """
+
+    def __init__(self, admission: CreditAdmission, minutes: int) -> None:
+        """."""
+
+        self.minutes = minutes
+        self._admission = admission
+        self._settled = False
+
+    def commit(self) -> None:
+        """Mark the reserved minutes as spent."""
+
+        if not self._settled:
+            self._settled = True
+            self._admission._settle(minutes=self.minutes, spent=True)
+
+    def release(self) -> None:
+        """Return the reserved minutes to the balance."""
+
+        if not self._settled:
+            self._settled = True
+            self._admission._settle(minutes=self.minutes, spent=False)
+
+
+class CreditAdmission:
+    """Admit jobs only while the minutes balance can cover them.
+
+    The balance from ``get_credits`` is cached for ``refresh_interval`` seconds rather than
+    requested per job, and minutes of admitted jobs are reserved locally until they are
+    committed or released, so concurrent jobs cannot overdraw the balance together. Jobs
+    needing more minutes than the whole balance are rejected, other jobs which do not fit
+    wait for reserved minutes to be released unless ``wait`` is disabled.
+    """
+
+    def __init__(
+        self, client: RaskSDKClient, refresh_interval: float = 300.0, wait: bool = True
+    ) -> None:
+        """."""
+
+        self._client = client
+        self._refresh_interval = refresh_interval
+        self._wait = wait
+        self._balance: Optional[int] = None
+        self._refreshed_at = 0.0
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._released: Optional[asyncio.Event] = None
+
+        self.reserved = 0
+
+    @property
+    def balance(self) -> Optional[int]:
+        """Minutes left as last known, including reserved ones."""
+
+        return self._balance
+
+    @property
+    def available(self) -> Optional[int]:
+        """Minutes left as last known which are not reserved."""
+
+        return self._balance - self.reserved if self._balance is not None else None
+
+    async def refresh(self) -> int:
+        """Request the minutes balance."""
+
+        credits_ = await self._client.get_credits()
+        self._balance = credits_.minutes.total - credits_.minutes.used
+        self._refreshed_at = time.monotonic()
+        self._notify()
+
+        return self._balance
+
+    async def _get_balance(self) -> int:
+        """Cached minutes balance, refreshed once it is older than the interval."""
+
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            if (
+                self._balance is None
+                or time.monotonic() - self._refreshed_at >= self._refresh_interval
+            ):
+                return await self.refresh()
+
+            return self._balance
+
+    async def acquire(self, minutes: int) -> CreditReservation:
+        """Reserve minutes for a job, waiting for them to be released if needed."""
+
+        while True:
+            balance = await self._get_balance()
+            if minutes > balance:
+                raise RaskJobException(
+                    stage=enums.DubbingStage.ADMISSION.value,
+                    detail=f"Job needs {minutes} minutes, but only {balance} are left.",
+                )
+
+            if self.reserved + minutes <= balance:
+                self.reserved += minutes
+                return CreditReservation(admission=self, minutes=minutes)
+
+            if not self._wait:
+                raise RaskJobException(
+                    stage=enums.DubbingStage.ADMISSION.value,
+                    detail=(
+                        f"Job needs {minutes} minutes, but only {balance - self.reserved} "
+                        "are not reserved."
+                    ),
+                )
+
+            if self._released is None:
+                self._released = asyncio.Event()
+
+            # Balance is refreshed as well in case minutes have been topped up meanwhile
+            try:
+                await asyncio.wait_for(self._released.wait(), timeout=self._refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _settle(self, minutes: int, spent: bool) -> None:
+        self.reserved -= minutes
+        if spent and self._balance is not None:
+            self._balance -= minutes
+
+        # Spent minutes may leave waiting jobs no chance to fit, so they are woken up as well
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake up every job waiting for minutes."""
+
+        if self._released is not None:
+            self._released.set()
+            self._released = None
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import os
+import uuid
+from typing import AsyncIterator
+from typing import Iterable
+from typing import Optional
+from typing import Union
+
+from rask_sdk import enums
+from rask_sdk import schemas
+from rask_sdk.clients.rask_client import RaskSDKClient
+from rask_sdk.concurrency import map_concurrently
+from rask_sdk.exceptions.base import RaskClientException
+from rask_sdk.exceptions.base import RaskJobException
+from rask_sdk.storage.journal import JobJournal
+from rask_sdk.storage.journal import JournalEntry
+from rask_sdk.workflows.credits import CreditAdmission
+from rask_sdk.workflows.credits import CreditReservation
+from rask_sdk.workflows.credits import duration_minutes
+from rask_sdk.workflows.credits import media_duration
+from rask_sdk.workflows.lipsync import LipsyncScheduler
+
+
+PROJECT_FAILED_STATUSES = frozenset(
+    {
+        enums.ProjectStatus.UPLOAD_FAILED,
+        enums.ProjectStatus.TRANSCRIPTION_FAILED,
+        enums.ProjectStatus.TRANSCRIBE_SEGMENTS_FAILED,
+        enums.ProjectStatus.SEPARATE_BACKGROUND_FAILED,
+        enums.ProjectStatus.DETERMINE_SPEAKERS_FAILED,
+        enums.ProjectStatus.VOICE_SUGGEST_FAILED,
+        enums.ProjectStatus.TRANSLATION_FAILED,
+        enums.ProjectStatus.VOICE_UPDATE_FAILED,
+        enums.ProjectStatus.VOICEOVER_FAILED,
+        enums.ProjectStatus.MERGING_FAILED,
+        enums.ProjectStatus.FAILED,
+        enums.ProjectStatus.NO_AUDIO,
+        enums.ProjectStatus.NO_WORDS,
+        enums.ProjectStatus.FORBIDDEN_LINK,
+    }
+)
+
+
+@dataclasses.dataclass
+class DubbingJob:
+    """Single video to be dubbed.
+
+    Exactly one media source should be provided: a local file path, a link or an id of
+    media which has already been uploaded. If ``duration_seconds`` is known beforehand,
+    credits are checked before uploading the media.
+    """
+
+    dst_lang: str
+    file_path: Optional[Union[str, os.PathLike]] = None
+    media_link: Optional[schemas.MediaCreateLink] = None
+    media_id: Optional[uuid.UUID] = None
+    kind: Optional[enums.MediaKind] = None
+    name: Optional[str] = None
+    src_lang: Optional[str] = None
+    num_speakers: Optional[int] = None
+    transcript_id: Optional[uuid.UUID] = None
+    glossary_id: Optional[uuid.UUID] = None
+    generate: bool = False
+    lipsync: bool = False
+    lipsync_data: Optional[schemas.LipsyncTaskData] = None
+    duration_seconds: Optional[int] = None
+    key: Optional[str] = None
+
+    def journal_key(self) -> str:
+        """Key identifying the job in a journal, derived from its parameters unless set."""
+
+        if self.key is not None:
+            return self.key
+
+        return hashlib.sha256(repr(dataclasses.astuple(self)).encode("utf-8")).hexdigest()
+
+
+@dataclasses.dataclass
+class DubbingJobResult:
+    """Outcome of a single dubbing job."""
+
+    job: DubbingJob
+    stage: enums.DubbingStage = enums.DubbingStage.UPLOAD
+    media_id: Optional[uuid.UUID] = None
+    project: Optional[schemas.ProjectGet] = None
+    lipsync_info: Optional[schemas.LipsyncInfo] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job has gone through all of its stages."""
+
+        return self.error is None and self.stage is enums.DubbingStage.DONE
+
+
+class _StageLimits:
+    """Per-stage semaphores, created inside the running event loop."""
+
+    def __init__(self, upload: int, project: int, poll: int) -> None:
+        """."""
+
+        self.upload = asyncio.Semaphore(upload)
+        self.project = asyncio.Semaphore(project)
+        self.poll = asyncio.Semaphore(poll)
+
+
+class DubbingPipeline:
+    """Dub a batch of videos end to end.
+
+    Every job runs as its own chain of stages (upload -> create project -> wait ->
+    [generate -> wait] -> [lipsync]). Each stage is bounded by its own concurrency limit, so
+    uploads of later videos overlap with the processing of earlier ones, and results are
+    yielded as soon as a job finishes. Lipsync is submitted through a ``LipsyncScheduler``
+    which throttles submissions by the lipsync queue depth.
+
+    With ``admission`` set, minutes of every job are reserved as soon as its duration is
+    known and before its project is created, so jobs which cannot be paid for are rejected
+    or queued instead of failing after their media has been processed. Media still being
+    processed is waited for, and jobs whose media duration stays unknown are rejected.
+
+    With ``journal`` set, every completed step is recorded along with the media and project
+    ids, so running the same jobs again after a crash only waits for or retries what is
+    outstanding instead of uploading and creating everything again. A generation request is
+    recorded before it is sent and checked against the project status on resume, and jobs
+    whose project has failed get a new project from the same media.
+    """
+
+    def __init__(
+        self,
+        client: RaskSDKClient,
+        upload_concurrency: int = 4,
+        project_concurrency: int = 16,
+        poll_concurrency: int = 32,
+        lipsync_concurrency: int = 8,
+        max_lipsync_queue_depth: int = 20,
+        poll_interval: float = 10.0,
+        admission: Optional[CreditAdmission] = None,
+        journal: Optional[JobJournal] = None,
+    ) -> None:
+        """."""
+
+        self._client = client
+        self._upload_concurrency = upload_concurrency
+        self._project_concurrency = project_concurrency
+        self._poll_concurrency = poll_concurrency
+        self._lipsync_concurrency = lipsync_concurrency
+        self._max_lipsync_queue_depth = max_lipsync_queue_depth
+        self._poll_interval = poll_interval
+        self._admission = admission
+        self._journal = journal
+
+    async def run(self, jobs: Iterable[DubbingJob]) -> AsyncIterator[DubbingJobResult]:
+        """Run jobs concurrently yielding their results in completion order."""
+
+        limits = _StageLimits(
+            upload=self._upload_concurrency,
+            project=self._project_concurrency,
+            poll=self._poll_concurrency,
+        )
+        lipsync_scheduler = LipsyncScheduler(
+            client=self._client,
+            max_in_flight=self._lipsync_concurrency,
+            max_queue_depth=self._max_lipsync_queue_depth,
+            min_poll_interval=self._poll_interval,
+            max_poll_interval=max(self._poll_interval, 60.0),
+        )
+
+        async def run_job(job: DubbingJob) -> DubbingJobResult:
+            return await self._run_job(
+                job=job, limits=limits, lipsync_scheduler=lipsync_scheduler
+            )
+
+        async for result in map_concurrently(run_job, jobs):
+            yield result
+
+    def _record(
+        self,
+        key: str,
+        stage: enums.DubbingStage,
+        media_id: Optional[uuid.UUID] = None,
+        project_id: Optional[uuid.UUID] = None,
+        generate_from: Optional[float] = None,
+    ) -> None:
+        if self._journal is not None:
+            self._journal.record(
+                key=key,
+                stage=stage,
+                media_id=media_id,
+                project_id=project_id,
+                generate_from=generate_from,
+            )
+
+    async def _run_job(
+        self, job: DubbingJob, limits: _StageLimits, lipsync_scheduler: LipsyncScheduler
+    ) -> DubbingJobResult:
+        """Run all stages of the job capturing the error of the failed one.
+
+        Steps recorded in the journal by a previous run are skipped, so the job continues
+        from the media and project it has already created.
+        """
+
+        from httpx import TransportError
+        from pydantic import ValidationError
+
+        result = DubbingJobResult(job=job)
+        reservation: Optional[CreditReservation] = None
+        key = job.journal_key()
+        entry = self._journal.get(key=key) if self._journal is not None else None
+        entry = entry or JournalEntry(key=key, stage=enums.DubbingStage.ADMISSION)
+
+        # Minutes are reserved only for jobs which have not been charged yet
+        charge_stage = (
+            enums.DubbingStage.GENERATE_PROJECT
+            if job.generate
+            else enums.DubbingStage.CREATE_PROJECT
+        )
+
+        try:
+            if entry.project_id is not None:
+                result.stage = enums.DubbingStage.WAIT_PROJECT
+                async with limits.poll:
+                    result.project = await self._client.get_project(
+                        project_id=entry.project_id
+                    )
+
+                # A project failed in a previous run is created again from the same media
+                if result.project.status in PROJECT_FAILED_STATUSES:
+                    if self._journal is not None:
+                        self._journal.reset_project(key=key)
+                    entry = JournalEntry(
+                        key=key, stage=enums.DubbingStage.UPLOAD, media_id=entry.media_id
+                    )
+                    result.project = None
+
+            admit = self._admission is not None and not entry.reached(charge_stage)
+
+            if admit and job.duration_seconds is not None:
+                assert self._admission is not None
+                result.stage = enums.DubbingStage.ADMISSION
+                reservation = await self._admission.acquire(
+                    minutes=duration_minutes(job.duration_seconds)
+                )
+                result.stage = enums.DubbingStage.UPLOAD
+
+            media: Optional[schemas.MediaGet] = None
+            if entry.media_id is not None:
+                result.media_id = entry.media_id
+            else:
+                media = await self._upload(job=job, limits=limits)
+                result.media_id = media.id if media is not None else job.media_id
+                self._record(
+                    key=key, stage=enums.DubbingStage.UPLOAD, media_id=result.media_id
+                )
+
+            assert result.media_id is not None
+
+            if admit and reservation is None and entry.project_id is None:
+                result.stage = enums.DubbingStage.ADMISSION
+                reservation = await self._reserve_media(
+                    media_id=result.media_id, media=media, limits=limits
+                )
+
+            if result.project is None:
+                result.stage = enums.DubbingStage.CREATE_PROJECT
+                async with limits.project:
+                    result.project = await self._client.create_project(
+                        data=schemas.ProjectCreate(
+                            video_id=result.media_id,
+                            name=job.name,
+                            src_lang=job.src_lang,
+                            dst_lang=job.dst_lang,
+                            num_speakers=job.num_speakers,
+                            transcript_id=job.transcript_id,
+                            glossary_id=job.glossary_id,
+                        )
+                    )
+                self._record(
+                    key=key,
+                    stage=enums.DubbingStage.CREATE_PROJECT,
+                    project_id=result.project.id,
+                )
+
+                if reservation is not None and not job.generate:
+                    reservation.commit()
+
+            result.stage = enums.DubbingStage.WAIT_PROJECT
+            result.project = await self._wait_project(project=result.project, limits=limits)
+
+            if job.generate:
+                # Generation requested by a previous run without being recorded as done has
+                # been accepted if the project status has changed since the request
+                generate_from = self._version(project=result.project)
+                generated = entry.reached(enums.DubbingStage.GENERATE_PROJECT) or (
+                    entry.generate_from is not None and entry.generate_from != generate_from
+                )
+                if not generated:
+                    if admit and reservation is None:
+                        result.stage = enums.DubbingStage.ADMISSION
+                        reservation = await self._reserve_media(
+                            media_id=result.media_id, media=None, limits=limits
+                        )
+
+                    result.stage = enums.DubbingStage.GENERATE_PROJECT
+                    self._record(
+                        key=key,
+                        stage=enums.DubbingStage.WAIT_PROJECT,
+                        generate_from=generate_from,
+                    )
+                    async with limits.project:
+                        result.project = await self._client.generate_project(
+                            project_id=result.project.id
+                        )
+                    self._record(key=key, stage=enums.DubbingStage.GENERATE_PROJECT)
+
+                    if reservation is not None:
+                        reservation.commit()
+
+                result.stage = enums.DubbingStage.WAIT_PROJECT
+                result.project = await self._wait_project(
+                    project=result.project, limits=limits
+                )
+
+            if job.lipsync:
+                # Lipsync may have been submitted without being recorded as done, so a resumed
+                # run waits for the submitted task instead of submitting it again
+                result.stage = enums.DubbingStage.LIPSYNC
+                resume = entry.reached(enums.DubbingStage.LIPSYNC)
+                self._record(key=key, stage=enums.DubbingStage.LIPSYNC)
+                result.lipsync_info = await lipsync_scheduler.run(
+                    project_id=result.project.id, data=job.lipsync_data, resume=resume
+                )
+
+            result.stage = enums.DubbingStage.DONE
+            self._record(key=key, stage=enums.DubbingStage.DONE)
+        except (
+            RaskClientException,
+            RaskJobException,
+            OSError,
+            TransportError,
+            ValidationError,
+        ) as exc:
+            result.error = exc
+        finally:
+            if reservation is not None:
+                reservation.release()
+
+        return result
+
+    async def _upload(
+        self, job: DubbingJob, limits: _StageLimits
+    ) -> Optional[schemas.MediaGet]:
+        """Upload job media unless it has already been uploaded."""
+
+        if job.media_id is not None:
+            return None
+
+        async with limits.upload:
+            if job.media_link is not None:
+                media = await self._client.create_media_link(data=job.media_link)
+            elif job.file_path is not None:
+                with open(job.file_path, "rb") as file:
+                    media = await self._client.create_media_file(file=file, kind=job.kind)
+            else:
+                raise RaskJobException(
+                    stage=enums.DubbingStage.UPLOAD.value, detail="No media source provided."
+                )
+
+        return media
+
+    async def _reserve_media(
+        self, media_id: uuid.UUID, media: Optional[schemas.MediaGet], limits: _StageLimits
+    ) -> CreditReservation:
+        """Reserve minutes by the media duration, waiting for the media to be processed.
+
+        Projects are never created without minutes reserved, so the job fails if the
+        duration of the media can not be found out.
+        """
+
+        assert self._admission is not None
+
+        while media is None or media.status is enums.MediaStatus.PROCESSING:
+            if media is not None:
+                await asyncio.sleep(self._poll_interval)
+            async with limits.poll:
+                media = await self._client.get_media(media_id=media_id)
+
+        duration = media_duration(media=media)
+        if media.status is enums.MediaStatus.FAILED or duration is None:
+            raise RaskJobException(
+                stage=enums.DubbingStage.ADMISSION.value,
+                detail=(
+                    f"Duration of media {media_id} with status {media.status.value} is "
+                    "unknown, so credits can not be checked."
+                ),
+            )
+
+        return await self._admission.acquire(minutes=duration_minutes(duration))
+
+    @staticmethod
+    def _version(project: schemas.ProjectGet) -> Optional[float]:
+        if project.status_updated_at is None:
+            return None
+
+        return project.status_updated_at.timestamp()
+
+    async def _wait_project(
+        self, project: schemas.ProjectGet, limits: _StageLimits
+    ) -> schemas.ProjectGet:
+        """Poll the project until dubbing is completed."""
+
+        while project.status is not enums.ProjectStatus.MERGING_DONE:
+            if project.status in PROJECT_FAILED_STATUSES:
+                raise RaskJobException(
+                    stage=enums.DubbingStage.WAIT_PROJECT.value,
+                    detail=f"Project {project.id} finished with status {project.status.value}.",
+                )
+
+            await asyncio.sleep(self._poll_interval)
+            async with limits.poll:
+                project = await self._client.get_project(project_id=project.id)
+
+        return project
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+import uuid
+from typing import AsyncIterator
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from rask_sdk import enums
+from rask_sdk import schemas
+from rask_sdk.clients.rask_client import RaskSDKClient
+from rask_sdk.concurrency import map_concurrently
+from rask_sdk.exceptions.base import RaskClientException
+from rask_sdk.exceptions.base import RaskJobException
+
+
+LIPSYNC_FAILED_STATUSES = frozenset(
+    {
+        enums.LipsyncStatus.FAILED,
+        enums.LipsyncStatus.OUTDATED,
+    }
+)
+
+
+@dataclasses.dataclass
+class LipsyncJobResult:
+    """Outcome of lipsync for a single project."""
+
+    project_id: uuid.UUID
+    info: Optional[schemas.LipsyncInfo] = None
+    error: Optional[Exception] = None
+
+    @property
+    def skipped(self) -> bool:
+        """Whether lipsync has been skipped because no face has been found in the video."""
+
+        return self.info is not None and self.info.video_has_face is False
+
+
+class LipsyncScheduler:
+    """Submit check face and lipsync tasks with respect to the lipsync queue.
+
+    Submissions wait while the last observed ``tasks_in_lipsync_queue`` is at or above
+    ``max_queue_depth``, videos without a face are never sent to lipsync, and in-flight
+    tasks are polled less often when their progress says they are far from completion.
+    """
+
+    def __init__(
+        self,
+        client: RaskSDKClient,
+        max_in_flight: int = 8,
+        max_queue_depth: int = 20,
+        min_poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+    ) -> None:
+        """."""
+
+        self._client = client
+        self._max_in_flight = max_in_flight
+        self._max_queue_depth = max_queue_depth
+        self._min_poll_interval = min_poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._queue_depth: Optional[int] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._queue_changed: Optional[asyncio.Condition] = None
+
+    @property
+    def queue_depth(self) -> Optional[int]:
+        """Last observed number of tasks in the lipsync queue."""
+
+        return self._queue_depth
+
+    def _primitives(self) -> Tuple[asyncio.Semaphore, asyncio.Condition]:
+        """Create synchronization primitives inside the running event loop."""
+
+        if self._in_flight is None or self._queue_changed is None:
+            self._in_flight = asyncio.Semaphore(self._max_in_flight)
+            self._queue_changed = asyncio.Condition()
+
+        return self._in_flight, self._queue_changed
+
+    async def _observe(self, tasks_in_lipsync_queue: Optional[int]) -> None:
+        """Record observed lipsync queue depth and wake up waiting submissions."""
+
+        if tasks_in_lipsync_queue is None:
+            return
+
+        _in_flight, queue_changed = self._primitives()
+        async with queue_changed:
+            self._queue_depth = tasks_in_lipsync_queue
+            queue_changed.notify_all()
+
+    async def _get_info(self, project_id: uuid.UUID) -> schemas.LipsyncInfo:
+        info = await self._client.get_lipsync_info(project_id=project_id)
+        await self._observe(info.tasks_in_lipsync_queue)
+
+        return info
+
+    async def _wait_for_queue(self, project_id: uuid.UUID) -> None:
+        """Wait until the lipsync queue is short enough to submit another task.
+
+        Depth is refreshed by polls of in-flight tasks; if none arrive in time, the queue
+        is probed through the lipsync info of the project itself.
+        """
+
+        _in_flight, queue_changed = self._primitives()
+
+        while self._queue_depth is not None and self._queue_depth >= self._max_queue_depth:
+            async with queue_changed:
+                try:
+                    await asyncio.wait_for(
+                        queue_changed.wait(), timeout=self._max_poll_interval
+                    )
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            await self._get_info(project_id=project_id)
+
+    def _poll_interval(self, started_at: float, progress: Optional[int]) -> float:
+        """Estimate when to poll next from the progress made so far."""
+
+        if not progress or progress <= 0:
+            return self._min_poll_interval
+
+        elapsed = time.monotonic() - started_at
+        remaining = elapsed * (100 - min(progress, 100)) / progress
+
+        return max(self._min_poll_interval, min(self._max_poll_interval, remaining / 2))
+
+    async def run(
+        self,
+        project_id: uuid.UUID,
+        data: Optional[schemas.LipsyncTaskData] = None,
+        resume: bool = False,
+    ) -> schemas.LipsyncInfo:
+        """Run check face task if needed, then lipsync, and wait for it to complete.
+
+        Returns the latest lipsync info; if no face has been found in the video, lipsync is
+        not submitted and ``video_has_face`` of the returned info is false. With ``resume``,
+        lipsync which has already been submitted for the project is waited for rather than
+        submitted again.
+        """
+
+        in_flight, _queue_changed = self._primitives()
+
+        async with in_flight:
+            info = await self._get_info(project_id=project_id)
+
+            if info.check_face_task_status is not enums.LipsyncStatus.DONE:
+                await self._wait_for_queue(project_id=project_id)
+                await self._client.run_check_face_task(project_id=project_id)
+
+                while info.check_face_task_status is not enums.LipsyncStatus.DONE:
+                    await asyncio.sleep(self._min_poll_interval)
+                    info = await self._get_info(project_id=project_id)
+
+                    if info.check_face_task_status in LIPSYNC_FAILED_STATUSES:
+                        raise RaskJobException(
+                            stage=enums.DubbingStage.CHECK_FACE.value,
+                            detail=f"Check face task for project {project_id} failed.",
+                        )
+
+            if info.video_has_face is False:
+                return info
+
+            if resume and info.lipsync_task_status is enums.LipsyncStatus.DONE:
+                return info
+
+            if not resume or info.lipsync_task_status is not enums.LipsyncStatus.STARTED:
+                await self._wait_for_queue(project_id=project_id)
+                response = await self._client.run_lipsync_task(
+                    project_id=project_id, data=data or schemas.LipsyncTaskData()
+                )
+                await self._observe(response.tasks_in_lipsync_queue)
+
+            started_at = time.monotonic()
+
+            while True:
+                await asyncio.sleep(
+                    self._poll_interval(
+                        started_at=started_at, progress=info.lipsync_task_progress
+                    )
+                )
+                info = await self._get_info(project_id=project_id)
+
+                if info.lipsync_task_status is enums.LipsyncStatus.DONE:
+                    return info
+
+                if info.lipsync_task_status in LIPSYNC_FAILED_STATUSES:
+                    raise RaskJobException(
+                        stage=enums.DubbingStage.LIPSYNC.value,
+                        detail=f"Lipsync task for project {project_id} failed.",
+                    )
+
+    async def run_many(
+        self, project_ids: Iterable[uuid.UUID], data: Optional[schemas.LipsyncTaskData] = None
+    ) -> AsyncIterator[LipsyncJobResult]:
+        """Run lipsync for many projects yielding results in completion order."""
+
+        async def run_job(project_id: uuid.UUID) -> LipsyncJobResult:
+            return await self._run_job(project_id=project_id, data=data)
+
+        async for result in map_concurrently(run_job, project_ids):
+            yield result
+
+    async def _run_job(
+        self, project_id: uuid.UUID, data: Optional[schemas.LipsyncTaskData]
+    ) -> LipsyncJobResult:
+        from httpx import TransportError
+        from pydantic import ValidationError
+
+        result = LipsyncJobResult(project_id=project_id)
+
+        try:
+            result.info = await self.run(project_id=project_id, data=data)
+        except (RaskClientException, RaskJobException, TransportError, ValidationError) as exc:
+            result.error = exc
+
+        return result
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import dataclasses
+import uuid
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from rask_sdk import schemas
+from rask_sdk.clients.rask_client import RaskSDKClient
+from rask_sdk.concurrency import map_concurrently
+from rask_sdk.exceptions.base import RaskClientException
+from rask_sdk.storage.transcripts import TranscriptIndex
+
+
+@dataclasses.dataclass
+class TranscriptIndexRefresh:
+    """Outcome of a single transcript index refresh."""
+
+    indexed: List[uuid.UUID] = dataclasses.field(default_factory=list)
+    removed: List[uuid.UUID] = dataclasses.field(default_factory=list)
+    unchanged: int = 0
+    errors: Dict[uuid.UUID, Exception] = dataclasses.field(default_factory=dict)
+
+
+class TranscriptIndexer:
+    """Keep a ``TranscriptIndex`` up to date with transcriptions of all projects.
+
+    Every refresh sweeps project list pages and downloads transcriptions only of projects
+    whose ``status_updated_at`` differs from the indexed one, so searching across thousands
+    of projects does not download any transcription again unless it may have changed.
+    Projects which are no longer listed are removed from the index once they are not found.
+    """
+
+    def __init__(
+        self,
+        client: RaskSDKClient,
+        index: TranscriptIndex,
+        page_size: int = 100,
+        concurrency: int = 8,
+    ) -> None:
+        """."""
+
+        self._client = client
+        self._index = index
+        self._page_size = page_size
+        self._concurrency = concurrency
+
+    async def _index_project(self, project: schemas.ProjectGetSlim) -> Optional[Exception]:
+        """Download and index the project transcription, returning the error if any."""
+
+        from httpx import TransportError
+        from pydantic import ValidationError
+
+        try:
+            segments = [
+                segment
+                async for segment in self._client.iter_project_transcription(
+                    project_id=project.id
+                )
+            ]
+        except (RaskClientException, TransportError, ValidationError) as exc:
+            return exc
+
+        self._index.set(
+            project_id=project.id,
+            segments=segments,
+            status_updated_at=project.status_updated_at,
+        )
+
+        return None
+
+    async def refresh(self) -> TranscriptIndexRefresh:
+        """Index transcriptions of new and changed projects."""
+
+        result = TranscriptIndexRefresh()
+        versions = self._index.versions()
+        listed = set()
+        stale: Dict[uuid.UUID, schemas.ProjectGetSlim] = {}
+
+        async for project in self._client.iter_projects(
+            page_size=self._page_size, concurrency=self._concurrency
+        ):
+            listed.add(project.id)
+
+            if self._index.is_stale(project=project):
+                stale[project.id] = project
+            else:
+                result.unchanged += 1
+
+        async def index_project(
+            project: schemas.ProjectGetSlim,
+        ) -> Tuple[uuid.UUID, Optional[Exception]]:
+            return project.id, await self._index_project(project=project)
+
+        async for project_id, error in map_concurrently(
+            index_project, stale.values(), self._concurrency
+        ):
+            if error is None:
+                result.indexed.append(project_id)
+            else:
+                result.errors[project_id] = error
+
+        # A project may be missed by a sweep when the list shifts, so it is removed only
+        # once the API confirms it no longer exists
+        async for missing in self._client.get_projects_by_ids(
+            project_ids=versions.keys() - listed, concurrency=self._concurrency
+        ):
+            if missing.not_found:
+                self._index.delete(project_id=missing.id)
+                result.removed.append(missing.id)
+            elif missing.error is not None:
+                result.errors[missing.id] = missing.error
+
+        return result
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import dataclasses
+import uuid
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from rask_sdk import schemas
+from rask_sdk.clients.rask_client import RaskSDKClient
+from rask_sdk.concurrency import map_concurrently
+from rask_sdk.exceptions.base import RaskClientException
+
+
+VoicePolicy = Callable[["schemas.ProjectGet", List["schemas.Voice"]], Dict[str, uuid.UUID]]
+
+
+def voices_by_label(labels: Dict[str, str]) -> VoicePolicy:
+    """Build policy assigning voices to speakers by voice label.
+
+    Speakers which are not in the project or whose label is missing from the project
+    voices are left untouched.
+    """
+
+    def policy(
+        project: schemas.ProjectGet, voices: List[schemas.Voice]
+    ) -> Dict[str, uuid.UUID]:
+        voice_ids = {voice.label: voice.id for voice in voices}
+        speakers = project.voice.keys() if project.voice else labels.keys()
+
+        return {
+            speaker: voice_ids[labels[speaker]]
+            for speaker in speakers
+            if speaker in labels and labels[speaker] in voice_ids
+        }
+
+    return policy
+
+
+@dataclasses.dataclass
+class VoiceAssignmentResult:
+    """Outcome of voice assignment for a single project."""
+
+    project_id: uuid.UUID
+    voices: Optional[List[schemas.Voice]] = None
+    voice: Optional[Dict[str, uuid.UUID]] = None
+    project: Optional[schemas.ProjectGet] = None
+    error: Optional[Exception] = None
+
+
+class VoiceAssigner:
+    """Discover and assign voices for many projects at once.
+
+    Identical voice catalogs returned for different projects are kept in memory once and
+    shared between the results.
+    """
+
+    def __init__(self, client: RaskSDKClient, concurrency: int = 8) -> None:
+        """."""
+
+        self._client = client
+        self._concurrency = concurrency
+        self._catalogs: Dict[Tuple, List[schemas.Voice]] = {}
+
+    def _intern(self, voices: List[schemas.Voice]) -> List[schemas.Voice]:
+        """Return the shared catalog equal to the voices provided."""
+
+        key = tuple(
+            (voice.id, voice.label, voice.gender, voice.sample_src) for voice in voices
+        )
+
+        return self._catalogs.setdefault(key, voices)
+
+    async def _get_voices(self, project_id: uuid.UUID) -> List[schemas.Voice]:
+        voices = await self._client.get_project_voices(project_id=project_id)
+
+        return self._intern(voices=voices)
+
+    async def get_voices(
+        self, project_ids: Iterable[uuid.UUID]
+    ) -> Dict[uuid.UUID, VoiceAssignmentResult]:
+        """Get voices of many projects keyed by project id."""
+
+        from httpx import TransportError
+        from pydantic import ValidationError
+
+        async def get_voices(project_id: uuid.UUID) -> VoiceAssignmentResult:
+            result = VoiceAssignmentResult(project_id=project_id)
+
+            try:
+                result.voices = await self._get_voices(project_id=project_id)
+            except (RaskClientException, TransportError, ValidationError) as exc:
+                result.error = exc
+
+            return result
+
+        return {
+            result.project_id: result
+            async for result in map_concurrently(get_voices, project_ids, self._concurrency)
+        }
+
+    async def assign(
+        self, project_ids: Iterable[uuid.UUID], policy: VoicePolicy
+    ) -> AsyncIterator[VoiceAssignmentResult]:
+        """Assign voices chosen by the policy yielding results in completion order.
+
+        Projects for which the policy chooses no voices are not patched.
+        """
+
+        from httpx import TransportError
+
+        async def assign(project_id: uuid.UUID) -> VoiceAssignmentResult:
+            result = VoiceAssignmentResult(project_id=project_id)
+
+            try:
+                # Requests of a project are sent one after another, so no more than
+                # ``concurrency`` requests are in flight at once
+                result.project = await self._client.get_project(project_id=project_id)
+                result.voices = await self._get_voices(project_id=project_id)
+                result.voice = policy(result.project, result.voices)
+
+                if result.voice:
+                    result.project = await self._client.patch_project(
+                        project_id=project_id, data=schemas.ProjectPatch(voice=result.voice)
+                    )
+            except (RaskClientException, TransportError, ValueError) as exc:
+                result.error = exc
+
+            return result
+
+        async for result in map_concurrently(assign, project_ids, self._concurrency):
+            yield result
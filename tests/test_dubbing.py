@@ -0,0 +1,235 @@
+import asyncio
+import collections
+import json
+import re
+import uuid
+
+import httpx
+from rask_sdk import enums
+from rask_sdk import schemas
+from rask_sdk.clients import RaskSDKClient
+from rask_sdk.storage import JobJournal
+from rask_sdk.workflows import DubbingJob
+from rask_sdk.workflows import DubbingPipeline
+
+
+TIMESTAMP = "2025-01-01T00:00:00"
+
+
+class FakeRask:
+    """In-memory Rask API counting requests, which can drop a response to simulate a crash."""
+
+    def __init__(self):
+        self.requests = collections.Counter()
+        self.projects = {}
+        self.lipsync = {}
+        self.created_from = []
+        # (method, route) -> "before" or "after" the request is applied
+        self.crashes = {}
+
+    def _project(self, project_id):
+        project = self.projects[project_id]
+
+        return {
+            "id": project_id,
+            "name": "video",
+            "source_type": "local",
+            "status": project["status"],
+            "status_updated_at": f"2025-01-01T00:00:{project['version']:02d}",
+        }
+
+    def _set_status(self, project_id, status):
+        self.projects[project_id]["status"] = status
+        self.projects[project_id]["version"] += 1
+
+    def handler(self, request):
+        method = request.method
+        path = request.url.path
+        project_match = re.match(r"/v2/projects/([^/]+)(/.*)?$", path)
+        route = project_match.group(2) or "" if project_match else path
+        crash = self.crashes.pop((method, route), None)
+
+        if crash == "before":
+            raise httpx.ConnectError("Connection reset.")
+
+        response = self._handle(request, method, path, project_match)
+        self.requests[(method, route)] += 1
+
+        if crash == "after":
+            raise httpx.ReadError("Connection reset.")
+
+        return response
+
+    def _handle(self, request, method, path, project_match):
+        if path.endswith("/oauth2/token"):
+            return httpx.Response(
+                200, json={"access_token": "t", "token_type": "Bearer", "expires_in": 3600}
+            )
+
+        if method == "POST" and path == "/api/library/v1/media/link":
+            media_id = str(uuid.uuid4())
+            return httpx.Response(
+                200,
+                json={
+                    "id": media_id,
+                    "user_id": media_id,
+                    "path": "video.mp4",
+                    "name": "video",
+                    "kind": "video",
+                    "status": "ready",
+                    "meta": {},
+                    "mime_type": "video/mp4",
+                    "created_at": TIMESTAMP,
+                    "updated_at": TIMESTAMP,
+                },
+            )
+
+        if method == "POST" and path == "/v2/projects":
+            project_id = str(uuid.uuid4())
+            self.projects[project_id] = {"status": "merging_done", "version": 0}
+            self.created_from.append(json.loads(request.content)["video_id"])
+            return httpx.Response(200, json=self._project(project_id))
+
+        project_id, route = project_match.group(1), project_match.group(2) or ""
+        project = self.projects[project_id]
+
+        if method == "GET" and route == "":
+            # Processing completes by the next poll
+            if project["status"] == "voiceover_started":
+                self._set_status(project_id, "merging_done")
+            return httpx.Response(200, json=self._project(project_id))
+
+        if method == "POST" and route == "/generate":
+            self._set_status(project_id, "voiceover_started")
+            return httpx.Response(200, json=self._project(project_id))
+
+        lipsync = self.lipsync.setdefault(project_id, {})
+        if method == "PUT" and route == "/check_face":
+            lipsync.update(check_face_task_status="done", video_has_face=True)
+            return httpx.Response(200, json={"check_face_task_status": "started"})
+
+        if method == "PUT" and route == "/lipsync":
+            lipsync.update(lipsync_task_status="started", lipsync_task_progress=0)
+            return httpx.Response(
+                200, json={"tasks_in_lipsync_queue": 1, "lipsync_task_status": "started"}
+            )
+
+        if method == "GET" and route == "/lipsync":
+            info = dict(lipsync, tasks_in_lipsync_queue=0)
+            if lipsync.get("lipsync_task_status") == "started":
+                lipsync.update(lipsync_task_status="done", lipsync_task_progress=100)
+            return httpx.Response(200, json=info)
+
+        return httpx.Response(404, json={"detail": f"No route for {method} {path}."})
+
+
+def run_job(rask, journal, job):
+    async def run():
+        client = RaskSDKClient("id", "secret", transport=httpx.MockTransport(rask.handler))
+        pipeline = DubbingPipeline(client=client, poll_interval=0, journal=journal)
+
+        return [result async for result in pipeline.run([job])][0]
+
+    return asyncio.run(run())
+
+
+def make_job(**kwargs):
+    return DubbingJob(
+        dst_lang="en",
+        media_link=schemas.MediaCreateLink(link="https://example.com/video.mp4"),
+        key="job",
+        **kwargs,
+    )
+
+
+def test_crash_before_generate_resumes_without_repeating_steps(tmp_path):
+    rask = FakeRask()
+    journal = JobJournal(tmp_path / "jobs.sqlite3")
+    job = make_job(generate=True)
+    rask.crashes[("POST", "/generate")] = "before"
+
+    assert run_job(rask, journal, job).error is not None
+    assert rask.requests[("POST", "/generate")] == 0
+
+    result = run_job(rask, journal, job)
+
+    assert result.ok
+    assert rask.requests[("POST", "/api/library/v1/media/link")] == 1
+    assert rask.requests[("POST", "/v2/projects")] == 1
+    assert rask.requests[("POST", "/generate")] == 1
+    assert journal.get("job").stage is enums.DubbingStage.DONE
+
+
+def test_crash_after_generate_does_not_generate_again(tmp_path):
+    rask = FakeRask()
+    journal = JobJournal(tmp_path / "jobs.sqlite3")
+    job = make_job(generate=True)
+    rask.crashes[("POST", "/generate")] = "after"
+
+    assert run_job(rask, journal, job).error is not None
+    assert rask.requests[("POST", "/generate")] == 1
+
+    result = run_job(rask, journal, job)
+
+    assert result.ok
+    assert rask.requests[("POST", "/api/library/v1/media/link")] == 1
+    assert rask.requests[("POST", "/v2/projects")] == 1
+    assert rask.requests[("POST", "/generate")] == 1
+
+
+def test_failed_project_is_created_again_from_the_same_media(tmp_path):
+    rask = FakeRask()
+    journal = JobJournal(tmp_path / "jobs.sqlite3")
+    job = make_job()
+
+    first = run_job(rask, journal, job)
+    assert first.ok
+    rask.projects[str(first.project.id)]["status"] = "failed"
+
+    result = run_job(rask, journal, job)
+
+    assert result.ok
+    assert result.project.id != first.project.id
+    assert rask.requests[("POST", "/api/library/v1/media/link")] == 1
+    assert rask.created_from == [str(first.media_id), str(first.media_id)]
+    assert journal.get("job").project_id == result.project.id
+
+
+def test_crash_after_lipsync_submission_waits_for_the_submitted_task(tmp_path):
+    rask = FakeRask()
+    journal = JobJournal(tmp_path / "jobs.sqlite3")
+    job = make_job(lipsync=True)
+    rask.crashes[("PUT", "/lipsync")] = "after"
+
+    assert run_job(rask, journal, job).error is not None
+    assert journal.get("job").stage is enums.DubbingStage.LIPSYNC
+
+    result = run_job(rask, journal, job)
+
+    assert result.ok
+    assert result.lipsync_info.lipsync_task_status is enums.LipsyncStatus.DONE
+    assert rask.requests[("PUT", "/lipsync")] == 1
+
+    # Running a completed job again neither submits lipsync nor moves the job back
+    assert run_job(rask, journal, job).ok
+    assert rask.requests[("PUT", "/lipsync")] == 1
+    assert journal.get("job").stage is enums.DubbingStage.DONE
+
+
+def test_journal_stage_never_moves_back(tmp_path):
+    journal = JobJournal(tmp_path / "jobs.sqlite3")
+    media_id, project_id = uuid.uuid4(), uuid.uuid4()
+
+    journal.record("job", enums.DubbingStage.UPLOAD, media_id=media_id)
+    journal.record("job", enums.DubbingStage.DONE, project_id=project_id)
+    journal.record("job", enums.DubbingStage.LIPSYNC)
+
+    entry = journal.get("job")
+    assert entry.stage is enums.DubbingStage.DONE
+    assert (entry.media_id, entry.project_id) == (media_id, project_id)
+
+    journal.reset_project("job")
+
+    entry = journal.get("job")
+    assert entry.stage is enums.DubbingStage.UPLOAD
+    assert (entry.media_id, entry.project_id) == (media_id, None)
@@ -0,0 +1,76 @@
+import json
+import random
+
+import pytest
+from rask_sdk.clients.streaming import JSONArrayParser
+
+
+def parse(chunks):
+    parser = JSONArrayParser(key="segments")
+
+    return [json.loads(item) for chunk in chunks for item in parser.feed(chunk)]
+
+
+def split(document, rng):
+    chunks = []
+    position = 0
+    while position < len(document):
+        size = rng.randint(1, 16)
+        chunks.append(document[position : position + size])
+        position += size
+
+    return chunks
+
+
+def random_string(rng):
+    return "".join(rng.choice('ab"\\/\n\t{}[]:,é') for _ in range(rng.randint(0, 8)))
+
+
+def random_value(rng, depth=0):
+    kind = rng.randint(0, 5 if depth < 3 else 2)
+    if kind == 0:
+        return random_string(rng)
+    if kind == 1:
+        return rng.randint(-100, 100)
+    if kind == 2:
+        return rng.choice([None, True, False])
+    if kind == 3:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+
+    return {random_string(rng): random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))}
+
+
+def random_document(rng):
+    document = {random_string(rng): random_value(rng) for _ in range(rng.randint(0, 3))}
+    # Nested arrays under the same key must not be mistaken for the top-level one
+    document["meta"] = {"segments": [random_value(rng)], "k": random_string(rng)}
+    document["segments"] = [
+        {"id": index, "text": random_string(rng), "nested": random_value(rng)}
+        for index in range(rng.randint(0, 5))
+    ]
+    document[random_string(rng) + "_after"] = random_value(rng)
+
+    return document
+
+
+def test_escape_split_across_chunks_before_array():
+    chunks = [b'{"meta": {"k": "a\\', b'"}", "x": 1}, "segments": [{"id": 1}]}']
+
+    assert parse(chunks) == [{"id": 1}]
+
+
+def test_escape_split_across_chunks_inside_item():
+    chunks = [b'{"segments": [{"text": "a\\', b'"]"}, {"text": "b"}]}']
+
+    assert parse(chunks) == [{"text": 'a"]'}, {"text": "b"}]
+
+
+@pytest.mark.parametrize("seed", range(500))
+def test_items_do_not_depend_on_chunk_boundaries(seed):
+    rng = random.Random(seed)
+    document = random_document(rng)
+    encoded = json.dumps(document, ensure_ascii=rng.random() < 0.5).encode("utf-8")
+
+    assert parse([encoded]) == document["segments"]
+    assert parse([encoded[i : i + 1] for i in range(len(encoded))]) == document["segments"]
+    assert parse(split(encoded, rng)) == document["segments"]